@@ -0,0 +1,185 @@
+# Palaiž app.py bez pārlūka (Streamlit AppTest) visos trīs režīmos un mēra
+# katras iezīmētās sekcijas (profiling.section) laiku un atmiņas maksimumu
+# pie dažādiem datu apjomiem. Rezultātu salīdzina ar saglabāto bāzi.
+# Palaišana no repozitorija saknes:
+#   python benchmarks/bench_app.py [--rows 4689,100000,1000000] [--starts 3] [--update]
+import argparse                 # Komandrindas argumenti
+import json                     # Bāzes fails
+import os                       # Ceļi, darba mape
+import shutil                   # Viktorīnas faila kopija
+import sys                      # Izejas kods
+import tempfile                 # Pagaidu mape sintētiskajiem datiem
+import numpy as np              # Sintētisko rindu ģenerēšana
+import pandas as pd             # CSV lasīšana/rakstīšana
+import streamlit as st          # Kešatmiņas tīrīšana starp aukstajiem startiem
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import profiling                # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+APP_PATH = os.path.join(ROOT, "app.py")
+SOURCE_CSV = os.path.join(ROOT, "riga.csv")
+QUIZ_CSV = os.path.join(ROOT, "real_estate_quiz_lv.csv")
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "bench_app_baseline.json")
+DEFAULT_ROWS = [0, 100_000, 1_000_000]  # 0 = oriģinālais riga.csv
+TOLERANCE = 1.5                 # Regresija: > 1.5× bāzes …
+MIN_DELTA_MS = 5.0              # … un vismaz par 5 ms (troksnis)
+MIN_DELTA_KIB = 1024.0          # … vai atmiņā vismaz par 1 MiB
+START_RUNS = 3                  # Aukstie starti; salīdzina mediānu (viens mērījums – troksnis)
+
+
+def synthesize(rows: int, out_path: str) -> int:     # riga.csv → `rows` rindas ar troksni
+    src = pd.read_csv(SOURCE_CSV)
+    if rows <= 0 or rows == len(src):
+        shutil.copyfile(SOURCE_CSV, out_path)
+        return len(src)
+    rng = np.random.default_rng(rows)
+    df = src.iloc[rng.integers(len(src), size=rows)].reset_index(drop=True)
+    df["price"] = np.round(df["price"] * rng.lognormal(0, 0.1, rows))  # Cenas ap oriģinālu
+    df["area"] = np.round(df["area"] * rng.uniform(0.9, 1.1, rows), 1)
+    df["lat"] += rng.normal(0, 0.003, rows)          # ~300 m izkliede
+    df["lon"] += rng.normal(0, 0.005, rows)
+    df.to_csv(out_path, index=False)
+    return rows
+
+
+def btn(at: AppTest, label: str):
+    return next(b for b in at.button if b.label == label)
+
+
+def timed(profile: profiling.Profile, action):       # Viens rerun kā sekcija "rerun"
+    profile.enter()
+    try:
+        at = action()
+    finally:
+        profile.exit("rerun")
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return at
+
+
+def play(at: AppTest, profile: profiling.Profile, rounds: int):  # Scenārijs visos režīmos
+    for _ in range(rounds):                          # 1. Cenu minēšana
+        at.number_input[0].set_value(50_000)
+        timed(profile, btn(at, "Apstiprināt minējumu").click().run)
+        timed(profile, btn(at, "Nākošais īpašums").click().run)
+    timed(profile, at.sidebar.radio[0].set_value("Kurš ir dārgāks?").run)
+    for i in range(rounds):                          # 2. Kurš ir dārgāks?
+        timed(profile, btn(at, "AB"[i % 2] + " ir dārgāks").click().run)
+    timed(profile, at.sidebar.select_slider[0].set_value("Grūti").run)
+    timed(profile, btn(at, "A ir dārgāks").click().run)
+    timed(profile, at.sidebar.radio[0].set_value("Viktorīna").run)
+    for _ in range(rounds):                          # 3. Viktorīna
+        timed(profile, btn(at, "Pārbaudīt atbildi").click().run)
+        timed(profile, btn(at, "Nākošais jautājums").click().run)
+
+
+def measure(phase: str, action) -> dict:             # {fāze.sekcija: mērījums} vienai darbībai
+    profile = profiling.start(memory=True)
+    try:
+        action(profile)
+    finally:
+        profiling.stop()
+    return {
+        f"{phase}.{name}": {
+            "calls": calls,
+            "ms": round(total / calls * 1000, 3),    # Vidēji uz izsaukumu
+            "kib": round(peak / 1024, 1),
+        }
+        for name, (calls, total, peak) in profile.sections.items()
+    }
+
+
+def median_runs(runs: list) -> dict:                 # Sekcija → mediāna pa palaišanām
+    out = {}
+    for key in runs[0]:
+        vals = [r[key] for r in runs if key in r]
+        out[key] = {
+            "calls": vals[0]["calls"],
+            "ms": round(float(np.median([v["ms"] for v in vals])), 3),
+            "kib": round(float(np.median([v["kib"] for v in vals])), 1),
+        }
+    return out
+
+
+def run_scale(rows: int, workdir: str, rounds: int, starts: int) -> tuple:  # (rindas, {fāze.sekcija: mērījums})
+    csv = os.path.join(workdir, "riga.csv")
+    rows = synthesize(rows, csv)
+    runs = []
+    for _ in range(max(1, starts)):                  # Aukstais starts: bez krātuves un kešatmiņas
+        shutil.rmtree(os.path.join(workdir, "riga.store"), ignore_errors=True)
+        st.cache_resource.clear()
+        at = AppTest.from_file(APP_PATH, default_timeout=600)
+        at.query_params["seed"] = "1"                # Vienāda īpašumu secība katrā palaišanā
+        runs.append(measure("start", lambda profile: timed(profile, at.run)))
+    results = median_runs(runs)
+    results.update(measure("play", lambda profile: play(at, profile, rounds)))  # Spēle pēc pēdējā starta
+    return rows, results
+
+
+def compare(current: dict, base: dict) -> list:      # Regresiju saraksts
+    out = []
+    for key, cur in current.items():
+        ref = base.get(key)
+        if ref is None:                              # Jauna sekcija – bāze jāatjauno
+            if base:
+                out.append(f"{key}: nav bāzē (palaidiet ar --update)")
+            continue
+        if cur["ms"] > ref["ms"] * TOLERANCE and cur["ms"] - ref["ms"] > MIN_DELTA_MS:
+            out.append(f"{key}: {ref['ms']:.1f} → {cur['ms']:.1f} ms")
+        if cur["kib"] > ref["kib"] * TOLERANCE and cur["kib"] - ref["kib"] > MIN_DELTA_KIB:
+            out.append(f"{key}: {ref['kib']:,.0f} → {cur['kib']:,.0f} KiB")
+    return out
+
+
+def report(rows: int, results: dict, base: dict):
+    print(f"\n=== {rows:,} rindas ===")
+    print(f"{'sekcija':<24}{'izs.':>6}{'ms/izs.':>12}{'bāze':>10}{'KiB maks.':>14}")
+    for key, r in sorted(results.items(), key=lambda kv: -kv[1]["ms"] * kv[1]["calls"]):
+        ref = base.get(key, {}).get("ms")
+        ref = f"{ref:.1f}" if ref is not None else "–"
+        print(f"{key:<24}{r['calls']:>6}{r['ms']:>12.1f}{ref:>10}{r['kib']:>14,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", default=",".join(map(str, DEFAULT_ROWS)),
+                        help="komatatdalīti rindu skaiti (0 = oriģinālais riga.csv)")
+    parser.add_argument("--rounds", type=int, default=5, help="raundi katrā režīmā")
+    parser.add_argument("--starts", type=int, default=START_RUNS, help="aukstie starti (mediāna)")
+    parser.add_argument("--update", action="store_true", help="pārrakstīt bāzi")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:   # app.py lasa relatīvos ceļus no cwd
+        shutil.copyfile(QUIZ_CSV, os.path.join(workdir, os.path.basename(QUIZ_CSV)))
+        os.chdir(workdir)
+        try:
+            for rows in sorted(int(r) for r in args.rows.split(",")):
+                rows, results = run_scale(rows, workdir, args.rounds, args.starts)
+                base = baseline.get(str(rows), {})
+                report(rows, results, base)
+                regressions += [f"{rows:,}: {r}" for r in compare(results, base)]
+                if args.update:
+                    baseline[str(rows)] = results
+        finally:
+            os.chdir(cwd)
+
+    if args.update:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+        print(f"\nBāze saglabāta: {os.path.relpath(BASELINE_PATH, ROOT)}")
+    elif regressions:
+        print("\nREGRESIJAS:")
+        print("\n".join(f"  {r}" for r in regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
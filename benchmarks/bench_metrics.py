@@ -0,0 +1,81 @@
+# Pārbauda, ka metriku slānis (profiling.section + metrics.count) aizņem
+# < 1% no rerun laika: izmēra viena āķa cenu un reizina ar āķu skaitu,
+# ko app.py izsauc bench_app.py scenārijā.
+# Palaišana no repozitorija saknes: python benchmarks/bench_metrics.py
+import os                       # Ceļi, darba mape
+import shutil                   # Viktorīnas faila kopija
+import sys                      # Izejas kods
+import tempfile                 # Pagaidu mape
+import time                     # Laika mērīšana
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_app import APP_PATH, QUIZ_CSV, play, synthesize  # noqa: E402
+import metrics                  # noqa: E402
+import profiling                # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+BUDGET = 0.01                   # Maks. pieļaujamā daļa no rerun laika
+CALLS = 200_000                 # Mikrobenchmarka iterācijas
+
+
+def per_call(fn) -> float:                           # Sekundes uz izsaukumu (bez cikla cenas)
+    loop = range(CALLS)
+    t0 = time.perf_counter()
+    for _ in loop:
+        pass
+    empty = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in loop:
+        fn()
+    return max(time.perf_counter() - t0 - empty, 0.0) / CALLS
+
+
+def hook_section():
+    with profiling.section("bench"):
+        pass
+
+
+def hook_count():
+    metrics.count("bench", mode="price")
+
+
+def main(rounds: int = 5):
+    cost_section = per_call(hook_section)
+    cost_count = per_call(hook_count)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        shutil.copyfile(QUIZ_CSV, os.path.join(workdir, os.path.basename(QUIZ_CSV)))
+        os.chdir(workdir)
+        try:
+            synthesize(0, os.path.join(workdir, "riga.csv"))
+            at = AppTest.from_file(APP_PATH, default_timeout=600)
+            at.query_params["seed"] = "1"
+            at.run()                                 # Aukstais starts netiek skaitīts
+            before = metrics.snapshot()
+            play(at, profiling.Profile(), rounds)
+            after = metrics.snapshot()
+        finally:
+            os.chdir(cwd)
+
+    def totals(snap):                                # (sekciju izsaukumi, skaitītāju izsaukumi, rerun s)
+        sections = sum(t["count"] for t in snap["timers"].values())
+        counters = sum(c["value"] for c in snap["counters"])
+        rerun = snap["timers"].get("rerun", {}).get("sum", 0.0)
+        return sections, counters, rerun
+
+    s0, c0, r0 = totals(before)
+    s1, c1, r1 = totals(after)
+    reruns = after["timers"]["rerun"]["count"] - before["timers"]["rerun"]["count"]
+    sections, counters, rerun_s = s1 - s0, c1 - c0, r1 - r0
+    overhead = (sections * cost_section + (counters + reruns) * cost_count) / rerun_s
+    print(f"section:          {cost_section * 1e6:8.2f} µs/izsaukums")
+    print(f"count:            {cost_count * 1e6:8.2f} µs/izsaukums")
+    print(f"rerun:            {reruns} × {rerun_s / reruns * 1000:.1f} ms")
+    print(f"āķi uz rerun:     {sections / reruns:.1f} sekcijas, {counters / reruns:.1f} skaitītāji")
+    print(f"virsizdevumi:     {overhead:.4%} (budžets {BUDGET:.0%})")
+    assert overhead < BUDGET, "metriku virsizdevumi pārsniedz budžetu"
+
+
+if __name__ == "__main__":
+    main()
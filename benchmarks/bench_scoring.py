@@ -0,0 +1,56 @@
+# Salīdzina raundu pa raundam punktu skaitīšanu ar score_batch.
+# Palaišana no repozitorija saknes: python benchmarks/bench_scoring.py [N]
+import os                       # Ceļš līdz repozitorija saknei
+import sys                      # Komandrindas arguments
+import time                     # Laika mērīšana
+import numpy as np              # Sintētiski minējumi
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scoring import calculate_points, error_percent, score_batch  # noqa: E402
+
+
+def per_round(guesses, indices, prices) -> dict:     # Tā pati loģika kā app.py, cikls
+    score, rounds, total_error = 0, 0, 0.0
+    out = {"points": [], "score": [], "average_error": []}
+    for guess, i in zip(guesses.tolist(), indices.tolist()):
+        real_price = float(prices[i])
+        if real_price <= 0:                          # Raunds neskaitās
+            out["points"].append(0)
+        else:
+            error_pct = error_percent(guess, real_price)
+            points = calculate_points(error_pct)
+            score += points
+            rounds += 1
+            total_error += error_pct
+            out["points"].append(points)
+        out["score"].append(score)
+        out["average_error"].append(total_error / rounds if rounds else 0.0)
+    return out
+
+
+def main(n: int = 1_000_000):
+    rng = np.random.default_rng(0)
+    prices = rng.lognormal(11, 1, 50_000)            # Sintētiskas cenas
+    prices[rng.integers(len(prices), size=50)] = 0   # Daži nederīgi ieraksti
+    indices = rng.integers(len(prices), size=n)
+    guesses = np.round(prices[indices] * rng.lognormal(0, 0.3, n))  # Minējumi ap cenu
+
+    t0 = time.perf_counter()
+    slow = per_round(guesses, indices, prices)
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    fast = score_batch(guesses, indices, prices)
+    t_batch = time.perf_counter() - t0
+
+    assert np.array_equal(fast.points, slow["points"])         # Rezultāti sakrīt precīzi
+    assert np.array_equal(fast.score, slow["score"])
+    assert np.array_equal(fast.average_error, slow["average_error"])
+    print(f"raundi:           {n:,}")
+    print(f"pa vienam:        {t_loop:8.3f} s  ({n / t_loop:,.0f} raundi/s)")
+    print(f"score_batch:      {t_batch:8.3f} s  ({n / t_batch:,.0f} raundi/s)")
+    print(f"paātrinājums:     {t_loop / t_batch:8.1f}×")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
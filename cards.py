@@ -0,0 +1,117 @@
+from functools import lru_cache  # Renderēto kartiņu kešs
+import numpy as np              # Kolonnu masīvi
+import pandas as pd             # Ievade no DataFrame
+
+MISSING = "Nav dati"            # Teksts trūkstošai vērtībai
+OP_LINES = {                    # Darījuma tipa teikums
+    "rent": "Šis īpašums ir **IZĪRĒŠANAI**.",
+    "sale": "Šis īpašums ir **PĀRDOŠANAI**.",
+    None: "Darījuma tips nav zināms.",
+}
+
+
+class PropertyRecord:                                # Viena īpašuma attēlojamie lauki
+    __slots__ = (
+        "idx", "op", "district", "street", "rooms", "area",
+        "floor", "total_floors", "house_type", "condition", "price", "lat", "lon",
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields[name])
+
+    @property
+    def has_location(self) -> bool:                  # Vai ir koordinātes
+        return not (np.isnan(self.lat) or np.isnan(self.lon))
+
+    @property
+    def map_data(self) -> dict:                      # Dati st.map (bez DataFrame būvēšanas)
+        return {"lat": [self.lat], "lon": [self.lon]}
+
+
+def _labels(df: pd.DataFrame, col: str) -> np.ndarray:  # Kolonna → teksta masīvs
+    if col not in df.columns:
+        return np.full(len(df), MISSING, dtype=object)
+    s = df[col]
+    if isinstance(s.dtype, pd.CategoricalDtype):     # Formatē kategorijas, ne rindas
+        cats = np.array([str(c) for c in s.cat.categories] + [MISSING], dtype=object)
+        return cats[s.cat.codes.to_numpy()]          # Kods -1 → pēdējais (MISSING)
+    return s.astype(object).where(s.notna(), MISSING).astype(str).to_numpy(object)
+
+
+def _floats(df: pd.DataFrame, col: str) -> np.ndarray:
+    if col not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(np.float64, na_value=np.nan)
+
+
+def _ints(df: pd.DataFrame, col: str) -> np.ndarray:  # Stāvi (-1 = nav datu)
+    if col not in df.columns:
+        return np.full(len(df), -1, dtype=np.int16)
+    vals = pd.to_numeric(df[col], errors="coerce")
+    return vals.fillna(-1).to_numpy(np.int16)
+
+
+def _stack(parts: list, fn, col: str) -> np.ndarray:  # Nodalījumu kolonnas → viens masīvs
+    return np.concatenate([fn(df, col) for df in parts])
+
+
+def _translated(df: pd.DataFrame, col: str) -> np.ndarray:  # Latviskā kolonna, ja ir
+    return _labels(df, f"{col}_lv" if f"{col}_lv" in df else col)
+
+
+class CardTable:                                     # Masīvos balstīta īpašumu tabula
+    # `parts` – nodalījumu DataFrame tādā secībā kā kopējā indeksā (īre, tad
+    # pārdošana); masīvus veido tieši no tiem, bez kopējas DataFrame kopijas.
+    def __init__(self, parts: list, cache_size: int = 4096):
+        op = _stack(parts, _labels, "op_type")       # Darījuma tips → "rent"/"sale"/None
+        lower = pd.Series(op).str.lower()
+        self.op = np.where(lower.str.contains("rent"), "rent",
+                           np.where(lower.str.contains("sale"), "sale", None))
+        self.district = _stack(parts, _labels, "district")
+        self.street = _stack(parts, _labels, "street")
+        self.rooms = _stack(parts, _labels, "rooms")
+        self.house_type = _stack(parts, _translated, "house_type")
+        self.condition = _stack(parts, _translated, "condition")
+        self.area = _stack(parts, _floats, "area")
+        self.price = _stack(parts, _floats, "price")
+        self.estimate = _stack(parts, _floats, "price_est")  # Modeļa cena (NaN, ja nav)
+        self.lat = _stack(parts, _floats, "lat")
+        self.lon = _stack(parts, _floats, "lon")
+        self.floor = _stack(parts, _ints, "floor")
+        self.total_floors = _stack(parts, _ints, "total_floors")
+        self.render = lru_cache(maxsize=cache_size)(self._render)    # LRU pēc indeksa
+        self.summary = lru_cache(maxsize=cache_size)(self._summary)
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    def record(self, i: int) -> PropertyRecord:      # O(1) ieraksts bez pandas rindas
+        return PropertyRecord(
+            idx=int(i), op=self.op[i], district=self.district[i], street=self.street[i],
+            rooms=self.rooms[i], area=float(self.area[i]),
+            floor=int(self.floor[i]), total_floors=int(self.total_floors[i]),
+            house_type=self.house_type[i], condition=self.condition[i],
+            price=float(self.price[i]), lat=float(self.lat[i]), lon=float(self.lon[i]),
+        )
+
+    def _render(self, i: int) -> tuple:              # (darījuma teikums, kreisā, labā kolonna)
+        r = self.record(i)
+        area = MISSING if np.isnan(r.area) else f"{r.area:g} m²"
+        left = [
+            f"**Rajons:** {r.district}",
+            f"**Iela:** {r.street}",
+            f"**Istabas:** {r.rooms}",
+            f"**Platība:** {area}",
+        ]
+        right = []
+        if r.floor >= 0 and r.total_floors >= 0:     # Stāvs tikai, ja abi zināmi
+            right.append(f"**Stāvs:** {r.floor}/{r.total_floors}")
+        right.append(f"**Mājas tips:** {r.house_type}")
+        right.append(f"**Stāvoklis:** {r.condition}")
+        return OP_LINES[r.op], "  \n".join(left), "  \n".join(right)
+
+    def _summary(self, i: int) -> str:               # Īss apraksts pāru režīmam
+        r = self.record(i)
+        area = MISSING if np.isnan(r.area) else f"{r.area:g} m²"
+        return f"Rajons: {r.district}  \nIstabas: {r.rooms}  \nPlatība: {area}"
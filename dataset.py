@@ -0,0 +1,145 @@
+import copy                     # Iepriekšējā modeļa kopija papildināšanai
+import os                       # Failu mtime
+from dataclasses import dataclass  # Datu komplekta struktūra
+import numpy as np              # Atvasinātās kolonnas
+import pandas as pd             # DataFrame skati
+from cards import CardTable     # Iepriekš sagatavotas kartiņas
+from listing_store import ListingStore, open_store  # Kolonnu krātuve
+from estimator import PriceEstimator  # Bāzes cenu novērtējums
+from labels import CONDITION_MAP, HOUSE_TYPE_MAP  # Tulkojumi
+from price_index import build_price_indexes  # Cenu indekss pāru grūtībai
+from quality import QualityReport, check_parts  # Datu kvalitātes pārbaude
+from quiz import QuizBank, compile_quiz  # Viktorīnas jautājumu banka
+from spatial import GridIndex   # Telpiskais indekss
+
+@dataclass
+class DatasetBundle:                                 # Viss, kas vajadzīgs spēlei, vienuviet
+    store: ListingStore                              # Memmap krātuve
+    rent: pd.DataFrame                               # Īres nodalījums
+    sale: pd.DataFrame                               # Pārdošanas nodalījums
+    quiz: QuizBank                                   # Kompilēti viktorīnas jautājumi
+    cards: CardTable                                 # Īpašumu ieraksti un kartiņas
+    price_index: dict                                # Nodalījums → {pa rajoniem?: PriceIndex} (pozīcijas valid[nodalījums])
+    estimator: PriceEstimator                        # Bāzes cenu modelis (price_est kolonna)
+    spatial: dict                                    # Nodalījums → GridIndex (lokālie indeksi)
+    heat: dict                                       # Nodalījums → šūnu vid. cena/m² kartei
+    quality: QualityReport                           # Noraidītās rindas un rajonu robežas
+    valid: dict                                      # "rent"/"sale" → lokālie, "all" → kopējie derīgo indeksi
+
+    def offset(self, part: str) -> int:              # Nodalījuma sākums kopējā tabulā
+        return self.store.partitions[part].start
+
+    def listing_key(self, idx: int) -> str:          # "paaudze/nodalījums/rinda" – papildinot nemainās
+        part = "rent" if idx < self.offset("sale") else "sale"
+        return f"{self.store.generation[:8]}/{part}/{idx - self.offset(part)}"
+
+
+def source_mtimes(*paths: str) -> tuple:             # Kešatslēga: failu mtime (nav faila → None)
+    return tuple(
+        os.stat(p).st_mtime_ns if os.path.exists(p) else None for p in paths
+    )
+
+
+def _translate(col: pd.Series, mapping: dict) -> pd.Series:  # Tulko kategorijas, ne rindas
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        labels = [mapping.get(c, c) for c in col.cat.categories]
+        if len(set(labels)) == len(labels):          # Kodi paliek tie paši
+            return col.cat.rename_categories(labels)
+    return col.map(lambda v: mapping.get(v, v))
+
+
+def add_derived(df: pd.DataFrame) -> pd.DataFrame:   # Atvasinātās kolonnas vienreiz ielādē
+    price = df["price"].to_numpy(np.float32)
+    area = df["area"].to_numpy(np.float32)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ppm2 = np.where(area > 0, price / area, np.nan).astype(np.float32)
+    extra = {"price_per_m2": ppm2}                   # Cena par m²
+    if "house_type" in df.columns:
+        extra["house_type_lv"] = _translate(df["house_type"], HOUSE_TYPE_MAP)
+    if "condition" in df.columns:
+        extra["condition_lv"] = _translate(df["condition"], CONDITION_MAP)
+    return df.assign(**extra)
+
+
+def coordinates(df: pd.DataFrame, col: str) -> np.ndarray:  # lat/lon (nav kolonnas → NaN)
+    if col not in df.columns:
+        return np.full(len(df), np.nan)
+    return df[col].to_numpy(np.float64)
+
+
+def district_codes(df: pd.DataFrame) -> np.ndarray:  # Rajona kodi grupēšanai
+    if "district" not in df.columns:
+        return np.zeros(len(df), dtype=np.int32)
+    return df["district"].astype("category").cat.codes.to_numpy(np.int32)
+
+
+def district_stats(parts: dict) -> pd.DataFrame:     # Rajonu agregāti (vienreiz ielādē)
+    frames = []
+    for name, part in parts.items():
+        if part.empty or "district" not in part.columns:
+            continue
+        g = part.groupby("district", observed=True)
+        frames.append(pd.DataFrame({
+            "count": g.size(),
+            "median_price": g["price"].median(),
+            "median_ppm2": g["price_per_m2"].median(),
+        }).reset_index().assign(part=name))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def fit_estimator(store: ListingStore, parts: dict, masks: dict,
+                  previous: DatasetBundle | None = None) -> PriceEstimator:
+    # Apmāca tikai uz kvalitātes pārbaudi izturējušām rindām (`masks`).
+    # Ja iepriekšējā komplekta krātuve tikai papildināta (tā pati paaudze,
+    # rindu nav mazāk), modelim pievieno tikai jaunās rindas; citādi – no jauna
+    if previous is not None and previous.store.generation == store.generation and all(
+            store.rows[p] >= previous.store.rows[p] for p in parts):
+        estimator = copy.deepcopy(previous.estimator)  # Iepriekšējais komplekts paliek nemainīts
+        for name, part in parts.items():
+            start = previous.store.rows[name]
+            estimator.partial_fit(part.iloc[start:][masks[name][start:]])
+    else:
+        estimator = PriceEstimator()
+        for name, part in parts.items():
+            estimator.partial_fit(part[masks[name]])
+    return estimator
+
+
+def build_bundle(listings_path: str, quiz_path: str,
+                 previous: DatasetBundle | None = None) -> DatasetBundle:
+    # `previous` – novecojušais tās pašas pilsētas komplekts (ja reģistrā vēl
+    # ir); no tā ņem modeli papildināšanai un pārbaudi, ja rindas nav mainījušās
+    store = open_store(listings_path)                # Atver/papildina krātuvi
+    parts = {name: add_derived(store.frame(name)) for name in ("rent", "sale")}
+    same_rows = (previous is not None and previous.store.generation == store.generation
+                 and previous.store.rows == store.rows)
+    quality = previous.quality if same_rows else check_parts(parts)  # Piem., mainīta tikai viktorīna
+    masks = {name: quality.parts[name].mask for name in parts}
+    estimator = fit_estimator(store, parts, masks, previous)
+    valid = {name: quality.parts[name].valid for name in parts}
+    valid["all"] = np.concatenate([                  # Kopējā tabulā: īre, tad pārdošana
+        valid[name] + store.partitions[name].start for name in ("rent", "sale")
+    ]).astype(np.int32)
+    rent, sale = (                                   # Modeļa cena katram īpašumam
+        part.assign(price_est=estimator.predict(part)) for part in parts.values()
+    )
+    price_index = {                                  # Kārtoti cenu indeksi pāriem (tikai derīgās)
+        name: build_price_indexes(part["price"].to_numpy(np.float64)[valid[name]],
+                                  district_codes(part)[valid[name]])
+        for name, part in (("rent", rent), ("sale", sale))
+    }
+    spatial = {                                      # Režģa indeksi pa nodalījumiem
+        name: GridIndex(coordinates(part, "lat"), coordinates(part, "lon"))  # Bez koordinātēm – tukšs
+        for name, part in (("rent", rent), ("sale", sale))
+    }
+    heat = {                                         # Siltuma kartes dati, vienreiz
+        name: pd.DataFrame(grid.cell_summary(
+            np.where(masks[name], part["price_per_m2"].to_numpy(), np.nan)), copy=False)
+        for (name, grid), part in zip(spatial.items(), (rent, sale))
+    }
+    clean = {name: part[masks[name]] for name, part in parts.items()}  # Agregātiem – bez izlēcējiem
+    return DatasetBundle(
+        store, rent, sale, compile_quiz(quiz_path, district_stats(clean)), CardTable([rent, sale]),
+        price_index, estimator,
+        spatial, heat, quality, valid,
+    )
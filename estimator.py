@@ -0,0 +1,139 @@
+import numpy as np              # Normālvienādojumi, histogrammas
+import pandas as pd             # Ievade no DataFrame
+from labels import CONDITION_MAP, HOUSE_TYPE_MAP  # Zināmās kategorijas
+
+# Modelis (atsevišķi īrei un pārdošanai):
+#   log(cena/m²) = rajona mediāna + β · [1, mājas tips, stāvoklis, 1. stāvs, pēdējais stāvs, log platība]
+# Visa statistika ir summējama (histogrammas un XᵀX, Xᵀy, XᵀD), tāpēc jaunas
+# rindas var pievienot ar partial_fit bez pilnas pārrēķināšanas.
+
+LOG_MIN, LOG_MAX, N_BINS = np.log(0.01), np.log(1e6), 4096  # Mediānas histogrammas režģis
+RIDGE = 1.0                     # Regularizācija (izņemot brīvo locekli)
+HOUSE_TYPES = list(HOUSE_TYPE_MAP)
+CONDITIONS = list(CONDITION_MAP)
+N_FEATURES = 1 + len(HOUSE_TYPES) + len(CONDITIONS) + 3
+
+
+def _onehot(col: pd.Series, vocab: list) -> np.ndarray:  # Nezināms/tukšs → nulles
+    codes = pd.Categorical(col, categories=vocab).codes
+    out = np.zeros((len(col), len(vocab)))
+    hit = codes >= 0
+    out[np.flatnonzero(hit), codes[hit]] = 1.0
+    return out
+
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray:
+    if name not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[name], errors="coerce").to_numpy(np.float64, na_value=np.nan)
+
+
+def features(df: pd.DataFrame) -> np.ndarray:        # Pazīmju matrica (n × N_FEATURES)
+    floor, total = _column(df, "floor"), _column(df, "total_floors")
+    floor = np.where(floor < 0, np.nan, floor)       # Krātuvē -1 = nav datu
+    total = np.where(total < 0, np.nan, total)
+    area = _column(df, "area")
+    empty = pd.Series([None] * len(df), dtype=object)
+    return np.column_stack([
+        np.ones(len(df)),                            # Brīvais loceklis
+        _onehot(df["house_type"] if "house_type" in df else empty, HOUSE_TYPES),
+        _onehot(df["condition"] if "condition" in df else empty, CONDITIONS),
+        (floor == 1).astype(float),                  # Pirmais stāvs
+        ((floor == total) & (total > 1)).astype(float),  # Pēdējais stāvs
+        np.log(np.where(area > 0, area, np.nan)) - np.log(50.0),  # Platība ap 50 m²
+    ])
+
+
+class PriceModel:                                    # Viena nodalījuma modelis
+    def __init__(self):
+        self.districts = {}                          # Rajons → kolonnas nr.
+        self.hist = np.zeros((0, N_BINS))            # Rajons × log(cena/m²) histogramma
+        self.xtx = np.zeros((N_FEATURES, N_FEATURES))
+        self.xty = np.zeros(N_FEATURES)
+        self.xtd = np.zeros((N_FEATURES, 0))         # Xᵀ · rajonu indikatori
+        self.n = 0
+        self._solved = None                          # (mediānas, globālā mediāna, β)
+
+    def _district_codes(self, col: pd.Series) -> np.ndarray:  # Jauni rajoni → jaunas kolonnas
+        for name in pd.unique(col.dropna().astype(str)):
+            if name not in self.districts:
+                self.districts[name] = len(self.districts)
+        grow = len(self.districts) - self.hist.shape[0]
+        if grow:
+            self.hist = np.vstack([self.hist, np.zeros((grow, N_BINS))])
+            self.xtd = np.hstack([self.xtd, np.zeros((N_FEATURES, grow))])
+        return col.astype(str).map(self.districts).fillna(-1).to_numpy(np.int64)
+
+    def partial_fit(self, df: pd.DataFrame) -> "PriceModel":
+        if df.empty:
+            return self
+        price, area = _column(df, "price"), _column(df, "area")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            y = np.log(price / area)                 # log(cena/m²)
+        x = features(df)
+        district = df["district"] if "district" in df else pd.Series([None] * len(df))
+        g = self._district_codes(district)
+        ok = np.isfinite(y) & (g >= 0)
+        x = np.nan_to_num(x[ok])                     # Trūkstošas pazīmes → 0
+        y, g = y[ok], g[ok]
+        G = len(self.districts)
+        bins = ((y - LOG_MIN) / (LOG_MAX - LOG_MIN) * N_BINS).astype(np.int64)
+        bins = np.clip(bins, 0, N_BINS - 1)
+        self.hist += np.bincount(g * N_BINS + bins, minlength=G * N_BINS).reshape(G, N_BINS)
+        self.xtx += x.T @ x
+        self.xty += x.T @ y
+        self.xtd += pd.DataFrame(x).groupby(g).sum().reindex(range(G), fill_value=0).to_numpy().T
+        self.n += len(y)
+        self._solved = None                          # Nākamā prognoze pārrēķinās β
+        return self
+
+    @staticmethod
+    def _median(hist: np.ndarray) -> np.ndarray:     # Mediāna no histogrammas (log)
+        cum = np.cumsum(hist, axis=-1)
+        half = cum[..., -1:] / 2
+        b = np.minimum((cum < half).sum(axis=-1), N_BINS - 1)
+        return LOG_MIN + (b + 0.5) * (LOG_MAX - LOG_MIN) / N_BINS
+
+    def _solve(self) -> tuple:
+        if self._solved is None:
+            counts = self.hist.sum(axis=1)
+            med = self._median(self.hist)            # Rajonu mediānas
+            overall = float(self._median(self.hist.sum(axis=0))) if self.n else 0.0
+            med = np.where(counts > 0, med, overall)
+            ridge = RIDGE * np.eye(N_FEATURES)
+            ridge[0, 0] = 0.0
+            rhs = self.xty - self.xtd @ med          # Xᵀ(y − mediāna[rajons])
+            beta = np.linalg.lstsq(self.xtx + ridge, rhs, rcond=None)[0]
+            self._solved = (med, overall, beta)
+        return self._solved
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:  # Prognozētā cena EUR
+        med, overall, beta = self._solve()
+        district = df["district"] if "district" in df else pd.Series([None] * len(df))
+        g = district.astype(str).map(self.districts).fillna(-1).to_numpy(np.int64)
+        base = np.where(g >= 0, med[np.maximum(g, 0)], overall) if len(med) else overall
+        log_ppm2 = base + np.nan_to_num(features(df)) @ beta
+        return (np.exp(log_ppm2) * _column(df, "area")).astype(np.float32)
+
+
+class PriceEstimator:                                # Atsevišķs modelis īrei un pārdošanai
+    def __init__(self):
+        self.models = {"rent": PriceModel(), "sale": PriceModel()}
+
+    @staticmethod
+    def _parts(df: pd.DataFrame) -> dict:            # Nodalījums → rindu maska
+        op = df["op_type"].astype(str).str.lower()
+        return {"rent": op.str.contains("rent").to_numpy(),
+                "sale": op.str.contains("sale").to_numpy()}
+
+    def partial_fit(self, df: pd.DataFrame) -> "PriceEstimator":
+        for name, mask in self._parts(df).items():
+            self.models[name].partial_fit(df[mask])
+        return self
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        out = np.full(len(df), np.nan, dtype=np.float32)
+        for name, mask in self._parts(df).items():
+            if mask.any() and self.models[name].n:
+                out[mask] = self.models[name].predict(df[mask])
+        return out
@@ -0,0 +1,192 @@
+import atexit                   # Rindas izlādēšana, beidzot procesu
+import logging                  # Rakstīšanas kļūdas
+import queue                    # Nebloķējoša ierakstu rinda
+import sqlite3                  # Iebūvētā datubāze
+import threading                # Fona rakstītājs
+import time                     # Laika zīmogi
+import metrics                  # Neierakstīto rindu skaitītāji
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rounds (
+    id          INTEGER PRIMARY KEY,
+    ts          REAL    NOT NULL,
+    session_id  TEXT    NOT NULL,
+    player      TEXT    NOT NULL,
+    mode        TEXT    NOT NULL,
+    city        TEXT,
+    listing     TEXT,
+    question    INTEGER,
+    guess       REAL,
+    error_pct   REAL,
+    points      INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rounds_player ON rounds (player, ts);
+CREATE TABLE IF NOT EXISTS leaderboard (
+    player       TEXT PRIMARY KEY,
+    rounds       INTEGER NOT NULL,
+    score        INTEGER NOT NULL,
+    price_rounds INTEGER NOT NULL,
+    total_error  REAL    NOT NULL,
+    updated      REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS leaderboard_score ON leaderboard (score DESC);
+"""
+INSERT_ROUND = """
+INSERT INTO rounds (ts, session_id, player, mode, city, listing, question, guess, error_pct, points)
+VALUES (:ts, :session_id, :player, :mode, :city, :listing, :question, :guess, :error_pct, :points)
+"""
+UPSERT_LEADER = """
+INSERT INTO leaderboard (player, rounds, score, price_rounds, total_error, updated)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (player) DO UPDATE SET
+    rounds       = rounds + excluded.rounds,
+    score        = score + excluded.score,
+    price_rounds = price_rounds + excluded.price_rounds,
+    total_error  = total_error + excluded.total_error,
+    updated      = excluded.updated
+"""
+ADDED_COLUMNS = {               # rounds kolonnas, kuru vecākās datubāzēs nav
+    "listing": "TEXT",          # Sludinājuma atslēga (agrāk listing_id – kopējais indekss)
+    "question": "INTEGER",      # Viktorīnas jautājuma nr.
+    "city": "TEXT",             # Pilsēta, kuras krātuvē ir `listing`
+}
+WRITE_ATTEMPTS = 3              # Mēģinājumi vienai paketei, pirms to atmest
+RETRY_DELAY = 1.0               # Pauze starp mēģinājumiem (s), pieaug lineāri
+log = logging.getLogger(__name__)
+ANONYMOUS = "Anonīms"           # Noklusējuma vārds – līderu tabulā netiek
+_STOP = object()                # Signāls rakstītājam beigt darbu
+
+
+def _connect(path: str) -> sqlite3.Connection:      # WAL: lasītāji netraucē rakstītājam
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _migrate(conn: sqlite3.Connection):              # Pievieno trūkstošās kolonnas
+    have = {row[1] for row in conn.execute("PRAGMA table_info(rounds)")}
+    for name, decl in ADDED_COLUMNS.items():
+        if name not in have:
+            conn.execute(f"ALTER TABLE rounds ADD COLUMN {name} {decl}")
+
+
+def named(player: str) -> bool:                      # Vai spēlētājs iekļaujams līderu tabulā
+    return bool(player.strip()) and player.strip() != ANONYMOUS
+
+
+class HistoryStore:                                  # Raundu vēsture + līderu tabula
+    # Visi ieraksti iet caur rindu uz vienu fona pavedienu, kas tos raksta
+    # paketēs vienā transakcijā; pogas klikšķis nekad negaida uz disku.
+    def __init__(self, path: str, batch_size: int = 500,
+                 flush_interval: float = 0.5, top_n: int = 10):
+        self.path = path
+        self.batch_size = batch_size                 # Maks. ierakstu skaits paketē
+        self.flush_interval = flush_interval         # Maks. gaidīšana pirms rakstīšanas (s)
+        self.top_n = top_n                           # Cik līderus turēt atmiņā
+        self.dropped = 0                             # Ieraksti, kas neietilpa rindā
+        self.failed = 0                              # Ieraksti, kurus neizdevās ierakstīt
+        self._queue = queue.Queue(maxsize=100_000)
+        conn = _connect(path)
+        conn.executescript(SCHEMA)
+        _migrate(conn)
+        self.leaders = self._read_top(conn)          # Līderu momentuzņēmums atmiņā
+        conn.close()
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ---------- RAKSTĪŠANA ----------
+    def record(self, session_id: str, player: str, mode: str, points: int,
+               city: str | None = None, listing: str | None = None, question: int | None = None,
+               guess: float | None = None, error_pct: float | None = None) -> bool:
+        row = {
+            "ts": time.time(), "session_id": session_id, "player": player,
+            "mode": mode, "city": city, "listing": listing, "question": question, "guess": guess,
+            "error_pct": error_pct, "points": int(points),
+        }
+        try:
+            self._queue.put_nowait(row)              # Nekad nebloķē
+            return True
+        except queue.Full:                           # Rinda pilna → ieraksts zūd
+            self.dropped += 1
+            metrics.count("history_dropped")
+            return False
+
+    def _run(self):                                  # Fona pavediens
+        conn = _connect(self.path)
+        stop = False
+        while not stop:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:      # Savāc, kas jau gaida rindā
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                stop = True
+                batch = [r for r in batch if r is not _STOP]
+            try:
+                if batch:
+                    conn = self._write_batch(conn, batch)
+            finally:                                 # flush() nedrīkst iestrēgt
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+        conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: list) -> sqlite3.Connection:
+        # Kļūda (disks pilns, tikai lasāms fails, slēdzenes noilgums) neaptur
+        # pavedienu: mēģina vēlreiz ar jaunu savienojumu, tad paketi atmet.
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                self._write(conn, batch)
+                return conn
+            except Exception:
+                log.warning("Vēstures pakete (%d rindas) nav ierakstīta, mēģinājums %d/%d",
+                            len(batch), attempt, WRITE_ATTEMPTS, exc_info=True)
+                metrics.count("history_write_errors")
+            time.sleep(RETRY_DELAY * attempt)
+            try:
+                conn.close()
+                conn = _connect(self.path)
+            except sqlite3.Error:                    # Savienojums vēl nav iespējams
+                pass
+        self.failed += len(batch)
+        metrics.count("history_failed_rows", len(batch))
+        return conn
+
+    def _write(self, conn: sqlite3.Connection, batch: list):
+        totals = {}                                  # Spēlētājs → izmaiņas līderu tabulā
+        for r in batch:
+            if not named(r["player"]):               # Anonīmās sesijas nesaplūst vienā rindā
+                continue
+            t = totals.setdefault(r["player"], [0, 0, 0, 0.0])
+            t[0] += 1
+            t[1] += r["points"]
+            if r["error_pct"] is not None:
+                t[2] += 1
+                t[3] += r["error_pct"]
+        now = time.time()
+        with conn:                                   # Viena transakcija paketei
+            conn.executemany(INSERT_ROUND, batch)
+            conn.executemany(UPSERT_LEADER, [(p, *t, now) for p, t in totals.items()])
+        self.leaders = self._read_top(conn)          # Atjauno momentuzņēmumu
+
+    def flush(self):                                 # Gaida, līdz rinda ierakstīta
+        self._queue.join()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    # ---------- LASĪŠANA ----------
+    def _read_top(self, conn: sqlite3.Connection) -> list:
+        return conn.execute(
+            "SELECT player, score, rounds, total_error / NULLIF(price_rounds, 0) "
+            "FROM leaderboard WHERE player != ? ORDER BY score DESC, rounds ASC LIMIT ?",
+            (ANONYMOUS, self.top_n),                 # Vecās datubāzēs tā rinda vēl var būt
+        ).fetchall()
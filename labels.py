@@ -0,0 +1,14 @@
+# ---------- TULKOJUMI ----------
+HOUSE_TYPE_MAP = {                                   # Māju tipu tulkojumi
+    "Brick": "Ķieģeļu māja",
+    "Brick-Panel": "Ķieģeļu-paneļu māja",
+    "Panel": "Paneļu māja",
+    "Panel-Brick": "Paneļu-ķieģeļu māja",
+    "Wood": "Koka māja",
+    "Masonry": "Mūra māja",
+}
+CONDITION_MAP = {                                    # Stāvokļu tulkojumi
+    "All amenities": "Ar visām ērtībām",
+    "Partial amenities": "Daļējas ērtības",
+    "Without amenities": "Bez ērtībām",
+}
@@ -0,0 +1,355 @@
+import hashlib                  # CSV sākuma nospiedums (pārrakstīts vai papildināts?)
+import io                       # Baitu bloks → pandas
+import json                     # Metadatu fails
+import os                       # Failu ceļi
+import shutil                   # Vecās krātuves dzēšana
+import time                     # Ielādes ātrums
+import uuid                     # Krātuves paaudzes ID
+from dataclasses import asdict, dataclass, field  # Ielādes atskaite
+import numpy as np              # Kolonnu masīvi un memmap
+import pandas as pd             # CSV parsēšana un DataFrame skati
+
+# ---------- SHĒMA ----------
+CATEGORY_COLUMNS = [            # Teksta kolonnas → kategorijas (kodi + vārdnīca)
+    "op_type", "district", "street", "rooms",
+    "house_seria", "house_type", "condition",
+]
+FLOAT_COLUMNS = ["price", "area", "lat", "lon"]  # float32 kolonnas
+SMALLINT_COLUMNS = ["floor", "total_floors"]     # int8 kolonnas (-1 = nav datu)
+PARTITIONS = ("rent", "sale")   # Katram nodalījumam savi kolonnu faili
+STORE_VERSION = 2               # Formāta versija (maiņa → pārbūve)
+CHUNK_BYTES = 32 << 20          # CSV lasīšanas bloka izmērs
+HEAD_BYTES = 64 << 10           # Cik baitus no sākuma salīdzina nospiedumā
+TAIL_BYTES = 64 << 10           # Cik baitus pirms ielādētā gala salīdzina nospiedumā
+
+
+def store_path(csv_path: str) -> str:            # Krātuves mape blakus CSV
+    return os.path.splitext(csv_path)[0] + ".store"
+
+
+def _codes_dtype(n_categories: int):             # Tāds pats kodu tips kā pandas
+    if n_categories < np.iinfo(np.int8).max:     # (tad Categorical nekopē kodus)
+        return np.int8
+    if n_categories < np.iinfo(np.int16).max:
+        return np.int16
+    return np.int32
+
+
+def _head_hash(csv_path: str, n: int) -> str:    # Pirmo n baitu SHA-1
+    with open(csv_path, "rb") as f:
+        return hashlib.sha1(f.read(n)).hexdigest()
+
+
+def _tail_hash(csv_path: str, end: int) -> str:  # SHA-1 baitiem tieši pirms `end`
+    start = max(0, end - TAIL_BYTES)
+    with open(csv_path, "rb") as f:
+        f.seek(start)
+        return hashlib.sha1(f.read(end - start)).hexdigest()
+
+
+def _complete_end(csv_path: str) -> int:         # Pozīcija aiz pēdējās pilnās rindas
+    size = os.path.getsize(csv_path)
+    with open(csv_path, "rb") as f:
+        pos = size
+        while pos > 0:                           # Meklē pēdējo "\n" no beigām
+            step = min(pos, 1 << 16)
+            f.seek(pos - step)
+            nl = f.read(step).rfind(b"\n")
+            if nl >= 0:
+                return pos - step + nl + 1
+            pos -= step
+    return 0
+
+
+# ---------- VALIDĀCIJA ----------
+@dataclass
+class IngestReport:                              # Ko ielāde izdarīja
+    rows_read: int = 0                           # Nolasītās CSV rindas
+    rows_kept: int = 0                           # Saglabātās rindas
+    rejected: dict = field(default_factory=dict) # Filtrs → noraidīto rindu skaits
+    bytes_read: int = 0
+    seconds: float = 0.0
+    mode: str = "full"                           # "full" / "append"
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows_read / self.seconds if self.seconds else 0.0
+
+    def add(self, rows_read: int, kept: int, rejected: dict):
+        self.rows_read += rows_read
+        self.rows_kept += kept
+        for name, n in rejected.items():
+            self.rejected[name] = self.rejected.get(name, 0) + n
+
+    def __str__(self) -> str:
+        rejected = ", ".join(f"{k}: {v}" for k, v in self.rejected.items()) or "nav"
+        return (f"{self.mode}: {self.rows_read} rindas ({self.rows_per_sec:,.0f}/s), "
+                f"saglabātas {self.rows_kept}, noraidītas – {rejected}")
+
+
+def clean_frame(df: pd.DataFrame) -> tuple:      # (derīgās rindas, noraidīto skaits pa filtriem)
+    rejected = {}
+
+    def keep(mask, name):                        # Piemēro filtru un pieskaita noraidītos
+        nonlocal df
+        rejected[name] = int((~mask).sum())
+        df = df[mask]
+
+    keep(df["op_type"].str.contains("For sale|For rent", case=False, na=False).to_numpy(),
+         "op_type")                              # Tikai “For sale”/“For rent”
+    df = df.assign(
+        price=pd.to_numeric(df["price"], errors="coerce"),  # Cena kā skaitlis
+        area=pd.to_numeric(df["area"], errors="coerce"),    # Platība kā skaitlis
+    )
+    keep(df["price"].notna().to_numpy(), "price_missing")
+    keep(df["area"].notna().to_numpy(), "area_missing")
+    keep((df["price"] > 0).to_numpy(), "price_nonpositive")
+    return df, rejected
+
+
+# ---------- LASĪŠANA PA GABALIEM ----------
+def iter_csv_chunks(csv_path: str, start: int, end: int, names: list,
+                    chunk_bytes: int = CHUNK_BYTES):
+    # Ģenerators: CSV baiti [start, end) pa blokiem, katrs nogriezts pie
+    # rindas beigām un parsēts atsevišķi (atmiņā tikai viens bloks)
+    dtype = {c: "str" for c in CATEGORY_COLUMNS}
+    with open(csv_path, "rb") as f:
+        f.seek(start)
+        pos, carry = start, b""
+        while pos < end:
+            data = f.read(min(chunk_bytes, end - pos))
+            pos += len(data)
+            block = carry + data
+            cut = block.rfind(b"\n") + 1 if pos < end else len(block)
+            carry, block = block[cut:], block[:cut]
+            if block.strip():
+                yield len(block), pd.read_csv(
+                    io.BytesIO(block), header=None, names=names, dtype=dtype,
+                )
+
+
+# ---------- RAKSTĪŠANA ----------
+def _col_file(path: str, part: str, name: str) -> str:
+    return os.path.join(path, part, f"{name}.bin")
+
+
+def _write_meta(path: str, meta: dict):          # Atomāri: tmp → replace
+    tmp = os.path.join(path, "meta.json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp, os.path.join(path, "meta.json"))
+
+
+class NeedsRebuild(Exception):                   # Papildinot vajag platāku kodu tipu
+    pass
+
+
+def _encode(meta: dict, path: str, df: pd.DataFrame, rewrite: bool) -> dict:  # Gabals → kolonnu masīvi
+    out = {}
+    for col in meta["columns"]:
+        vals = df[col]
+        if col in meta["categories"]:            # Kategorijas: vārdnīca tikai papildinās
+            cats = meta["categories"][col]
+            codes = pd.Index(cats, dtype=object).get_indexer(vals)  # Nezināms/tukšs → -1
+            new = pd.unique(vals[(codes < 0) & vals.notna().to_numpy()])
+            if len(new):
+                cats.extend(str(v) for v in new)
+                codes = pd.Index(cats, dtype=object).get_indexer(vals)
+                _widen_codes(meta, path, col, rewrite)
+            out[col] = codes.astype(meta["dtypes"][col])
+        elif col in SMALLINT_COLUMNS:            # int8 ar -1 tukšumiem
+            v = pd.to_numeric(vals, errors="coerce")
+            v = v.where(v.between(0, np.iinfo(np.int8).max))
+            out[col] = v.fillna(-1).to_numpy(np.int8)
+        else:                                    # float32
+            out[col] = pd.to_numeric(vals, errors="coerce").to_numpy(np.float32)
+    return out
+
+
+def _widen_codes(meta: dict, path: str, col: str, rewrite: bool):  # Vairāk kategoriju → platāks kodu tips
+    new = np.dtype(_codes_dtype(len(meta["categories"][col]))).name
+    old = meta["dtypes"][col]
+    if new == old:
+        return
+    if not rewrite:                              # Dzīva krātuve: faili ir memmap, meta.json – vecais tips
+        raise NeedsRebuild(col)
+    for part in PARTITIONS:                      # Reti: pārraksta tikai šo kolonnu
+        fname = _col_file(path, part, col)
+        np.fromfile(fname, dtype=old, count=meta["rows"][part]).astype(new).tofile(fname)
+    meta["dtypes"][col] = new
+
+
+def _append(meta: dict, path: str, df: pd.DataFrame, rewrite: bool):  # Pievieno rindas nodalījumu failiem
+    op = df["op_type"].str.lower()
+    masks = {"rent": op.str.contains("rent").to_numpy(), "sale": op.str.contains("sale").to_numpy()}
+    cols = _encode(meta, path, df, rewrite)
+    for part, mask in masks.items():
+        n = int(mask.sum())
+        if not n:
+            continue
+        for name, arr in cols.items():
+            with open(_col_file(path, part, name), "ab") as f:
+                f.write(np.ascontiguousarray(arr[mask]).tobytes())
+        meta["rows"][part] += n
+
+
+def _truncate(meta: dict, path: str):            # Nogriež nepabeigtu iepriekšējo pievienošanu
+    for part in PARTITIONS:
+        for name in meta["columns"]:
+            size = meta["rows"][part] * np.dtype(meta["dtypes"][name]).itemsize
+            with open(_col_file(path, part, name), "r+b") as f:
+                f.truncate(size)
+
+
+def _ingest_range(meta: dict, path: str, csv_path: str, start: int, end: int,
+                  report: IngestReport, chunk_bytes: int) -> IngestReport:
+    t0 = time.perf_counter()
+    for n_bytes, chunk in iter_csv_chunks(csv_path, start, end, meta["header"], chunk_bytes):
+        kept, rejected = clean_frame(chunk)
+        _append(meta, path, kept, rewrite=report.mode == "full")  # Pilnā – pagaidu mapē
+        report.add(len(chunk), len(kept), rejected)
+        report.bytes_read += n_bytes
+    report.seconds = time.perf_counter() - t0
+    meta["source"].update(offset=end, tail=_tail_hash(csv_path, end),
+                          mtime_ns=os.stat(csv_path).st_mtime_ns)
+    meta["last_ingest"] = {**asdict(report), "rows_per_sec": report.rows_per_sec}
+    for name, n in report.rejected.items():      # Kopējā noraidīto statistika
+        meta["rejected"][name] = meta["rejected"].get(name, 0) + n
+    _write_meta(path, meta)
+    return report
+
+
+def ingest_csv(csv_path: str, out_dir: str | None = None,
+               chunk_bytes: int = CHUNK_BYTES) -> IngestReport:  # Pilna pārbūve
+    out_dir = out_dir or store_path(csv_path)
+    header = pd.read_csv(csv_path, nrows=0).columns.tolist()
+    with open(csv_path, "rb") as f:
+        data_start = len(f.readline())           # Pirmā datu rinda
+    columns = [c for c in CATEGORY_COLUMNS + FLOAT_COLUMNS + SMALLINT_COLUMNS if c in header]
+    head_len = min(HEAD_BYTES, os.path.getsize(csv_path))
+    meta = {
+        "version": STORE_VERSION,
+        "generation": uuid.uuid4().hex,          # Mainās tikai pilnā pārbūvē
+        "header": header,
+        "columns": columns,
+        "categories": {c: [] for c in columns if c in CATEGORY_COLUMNS},
+        "dtypes": {c: "float32" if c in FLOAT_COLUMNS else "int8" for c in columns},
+        "rows": {part: 0 for part in PARTITIONS},
+        "source": {"offset": data_start, "head_len": head_len,
+                   "head": _head_hash(csv_path, head_len)},
+        "rejected": {},
+    }
+
+    tmp_dir = out_dir + ".tmp"                   # Raksta pagaidu mapē, tad pārsauc
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    for part in PARTITIONS:
+        os.makedirs(os.path.join(tmp_dir, part))
+        for name in columns:
+            open(_col_file(tmp_dir, part, name), "wb").close()
+    report = _ingest_range(meta, tmp_dir, csv_path, data_start, _complete_end(csv_path),
+                           IngestReport(mode="full"), chunk_bytes)
+    shutil.rmtree(out_dir, ignore_errors=True)   # Aizstāj veco krātuvi
+    os.replace(tmp_dir, out_dir)
+    return report
+
+
+def _read_meta(path: str) -> dict | None:
+    try:
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def check_source(csv_path: str, path: str | None = None) -> str:
+    # "ok" – aktuāla, "append" – CSV papildināts beigās, "full" – jāpārbūvē
+    meta = _read_meta(path or store_path(csv_path))
+    if meta is None or meta.get("version") != STORE_VERSION:
+        return "full"
+    src = meta["source"]
+    if os.path.getsize(csv_path) < src["offset"]:
+        return "full"                            # Fails saīsināts
+    if _head_hash(csv_path, src["head_len"]) != src["head"]:
+        return "full"                            # Sākums mainīts → pārrakstīts
+    if src.get("tail") != _tail_hash(csv_path, src["offset"]):
+        return "full"                            # Pārrakstīts ar to pašu sākumu (arī vecā krātuve bez "tail")
+    if os.stat(csv_path).st_mtime_ns == src.get("mtime_ns"):
+        return "ok"
+    return "append" if _complete_end(csv_path) > src["offset"] else "ok"
+
+
+def append_csv(csv_path: str, path: str | None = None,
+               chunk_bytes: int = CHUNK_BYTES) -> IngestReport:  # Tikai jaunās rindas
+    path = path or store_path(csv_path)
+    meta = _read_meta(path)
+    _truncate(meta, path)
+    try:
+        return _ingest_range(meta, path, csv_path, meta["source"]["offset"],
+                             _complete_end(csv_path), IngestReport(mode="append"), chunk_bytes)
+    except NeedsRebuild:                         # Reti: kodu tips jāpaplašina → pilna pārbūve
+        return ingest_csv(csv_path, path, chunk_bytes)
+
+
+def update_store(csv_path: str) -> IngestReport | None:  # Pārbūvē/papildina, ja vajag
+    state = check_source(csv_path)
+    if state == "full":
+        return ingest_csv(csv_path)
+    if state == "append":
+        return append_csv(csv_path)
+    return None
+
+
+# ---------- LASĪŠANA ----------
+class ListingStore:                               # Memmap kolonnas pa nodalījumiem
+    def __init__(self, path: str):
+        self.meta = _read_meta(path)
+        self.path = path
+        self.generation = self.meta["generation"]  # Pilnas pārbūves ID
+        self.categories = self.meta["categories"]
+        self.rows = self.meta["rows"]             # Nodalījums → rindu skaits
+        self.columns = {                          # Kolonnas no diska (lasīšanai)
+            part: {name: self._map(part, name) for name in self.meta["columns"]}
+            for part in PARTITIONS
+        }
+        start, self.partitions = 0, {}            # Nodalījumi kopējā indeksā: īre, tad pārdošana
+        for part in PARTITIONS:
+            self.partitions[part] = slice(start, start + self.rows[part])
+            start += self.rows[part]
+        self._frames = {}                         # Izveidotie DataFrame skati
+
+    def _map(self, part: str, name: str) -> np.ndarray:
+        dtype, n = np.dtype(self.meta["dtypes"][name]), self.rows[part]
+        if n == 0:                                # Tukšu failu nevar memmap
+            return np.empty(0, dtype=dtype)
+        return np.memmap(_col_file(self.path, part, name), dtype=dtype, mode="r", shape=(n,))
+
+    def __len__(self) -> int:
+        return sum(self.rows.values())
+
+    def frame(self, part: str) -> pd.DataFrame:   # Bezkopijas DataFrame skats
+        if part not in self._frames:
+            data = {}
+            for name, view in self.columns[part].items():
+                if name in self.categories:
+                    dtype = pd.CategoricalDtype(self.categories[name])
+                    data[name] = pd.Categorical.from_codes(view, dtype=dtype, validate=False)
+                elif name in SMALLINT_COLUMNS:
+                    data[name] = pd.arrays.IntegerArray(view, view < 0)
+                else:
+                    data[name] = view
+            self._frames[part] = pd.DataFrame(data, copy=False)
+        return self._frames[part]
+
+
+def open_store(csv_path: str) -> ListingStore:   # Atver (ja vajag – vispirms papildina)
+    update_store(csv_path)
+    return ListingStore(store_path(csv_path))
+
+
+if __name__ == "__main__":                        # python listing_store.py [--full] riga.csv ...
+    import sys
+    args = sys.argv[1:]
+    full = "--full" in args
+    for csv in [a for a in args if a != "--full"] or ["riga.csv"]:
+        report = ingest_csv(csv) if full else update_store(csv)
+        print(f"{csv}: {report or 'krātuve jau aktuāla'}")
@@ -0,0 +1,208 @@
+import json                     # JSON izgāztuve
+import os                       # Konfigurācija no vides mainīgajiem
+import threading                # Pavedienu shardi, eksportētāji
+import time                     # Laiks, aktīvās sesijas
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # /metrics
+
+# Procesa metriku reģistrs. Katrs pavediens raksta savā shardā (Streamlit
+# katru rerun palaiž savā pavedienā), tāpēc karstajā ceļā nav slēdzeņu;
+# eksportētājs shardus saskaita un mirušo pavedienu shardus saplūdina.
+PREFIX = "app_"                 # Prometheus nosaukumu prefikss
+SESSION_TTL = 300.0             # Sesija “aktīva”, ja redzēta pēdējās 5 min.
+
+
+class _Shard:                                        # Viena pavediena skaitītāji
+    __slots__ = ("thread", "counters", "timers", "t0")
+
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self.counters = {}                           # (nosaukums, etiķetes) → skaits
+        self.timers = {}                             # Nosaukums → [skaits, summa s, maks. s]
+        self.t0 = None                               # Pašreizējā rerun sākums
+
+    def merge_into(self, counters: dict, timers: dict):
+        for key, n in list(self.counters.items()):
+            counters[key] = counters.get(key, 0) + n
+        for name, (n, total, peak) in list(self.timers.items()):
+            t = timers.setdefault(name, [0, 0.0, 0.0])
+            t[0] += n
+            t[1] += total
+            t[2] = max(t[2], peak)
+
+
+_local = threading.local()
+_shards = []                    # Dzīvo pavedienu shardi (append/remove ir atomāri)
+_retired = _Shard()             # Beigušos pavedienu summas
+_sessions = {}                  # Sesijas ID → pēdējā rerun laiks
+_maintenance = threading.Lock() # Tikai saplūdināšanai; rakstītāji to negaida
+_started_at = time.time()       # Procesa sākums (uptime)
+
+
+def _shard() -> _Shard:
+    shard = getattr(_local, "shard", None)
+    if shard is None:
+        shard = _local.shard = _Shard()
+        _shards.append(shard)
+        if len(_shards) > 64:                        # Nav eksportētāja → tīra pats
+            retire()
+    return shard
+
+
+def retire():                                        # Mirušo pavedienu shardi → _retired
+    if not _maintenance.acquire(blocking=False):     # Kāds cits jau tīra
+        return
+    try:
+        for shard in list(_shards):
+            if not shard.thread.is_alive():
+                shard.merge_into(_retired.counters, _retired.timers)
+                _shards.remove(shard)
+        now = time.time()
+        for sid, seen in list(_sessions.items()):
+            if now - seen > SESSION_TTL:
+                _sessions.pop(sid, None)
+    finally:
+        _maintenance.release()
+
+
+# ---------- RAKSTĪŠANA ----------
+def count(name: str, n: int = 1, **labels):          # Skaitītājs (+n)
+    counters = _shard().counters
+    key = (name, tuple(sorted(labels.items()))) if labels else (name, ())
+    counters[key] = counters.get(key, 0) + n
+
+
+def observe(name: str, seconds: float):              # Viens laika mērījums
+    timers = _shard().timers
+    t = timers.get(name)
+    if t is None:
+        timers[name] = [1, seconds, seconds]
+    else:
+        t[0] += 1
+        t[1] += seconds
+        if seconds > t[2]:
+            t[2] = seconds
+
+
+def rerun_started():                                 # Skripta sākumā
+    _shard().t0 = time.perf_counter()
+
+
+def touch_session(session_id: str):                  # Sesija redzēta šajā rerun
+    _sessions[session_id] = time.time()
+
+
+def rerun_finished():                                # Skripta beigās (st.stop gadījumā netiek)
+    shard = _shard()
+    if shard.t0 is not None:
+        observe("rerun", time.perf_counter() - shard.t0)
+        shard.t0 = None
+
+
+# ---------- LASĪŠANA ----------
+def snapshot() -> dict:                              # Visu shardu summa
+    retire()
+    counters, timers = dict(_retired.counters), {k: list(v) for k, v in _retired.timers.items()}
+    for shard in list(_shards):
+        shard.merge_into(counters, timers)
+    now = time.time()
+    return {
+        "uptime_seconds": now - _started_at,
+        "sessions_active": sum(now - seen <= SESSION_TTL for seen in list(_sessions.values())),
+        "counters": [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(counters.items())
+        ],
+        "timers": {
+            name: {"count": n, "sum": total, "max": peak}
+            for name, (n, total, peak) in sorted(timers.items())
+        },
+    }
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}"
+
+
+def prometheus_text() -> str:                        # Prometheus teksta formāts
+    snap = snapshot()
+    lines = [
+        f"# TYPE {PREFIX}uptime_seconds gauge",
+        f"{PREFIX}uptime_seconds {snap['uptime_seconds']:.3f}",
+        f"# TYPE {PREFIX}sessions_active gauge",
+        f"{PREFIX}sessions_active {snap['sessions_active']}",
+    ]
+    typed = set()
+    for c in snap["counters"]:
+        name = f"{PREFIX}{c['name']}_total"
+        if name not in typed:
+            lines.append(f"# TYPE {name} counter")
+            typed.add(name)
+        lines.append(f"{name}{_labels(c['labels'])} {c['value']}")
+    if snap["timers"]:
+        lines.append(f"# TYPE {PREFIX}section_seconds summary")
+        for name, t in snap["timers"].items():
+            label = _labels({"section": name})
+            lines.append(f"{PREFIX}section_seconds_count{label} {t['count']}")
+            lines.append(f"{PREFIX}section_seconds_sum{label} {t['sum']:.6f}")
+        lines.append(f"# TYPE {PREFIX}section_seconds_max gauge")
+        for name, t in snap["timers"].items():
+            lines.append(f"{PREFIX}section_seconds_max{_labels({'section': name})} {t['max']:.6f}")
+    return "\n".join(lines) + "\n"
+
+
+def dump_json(path: str):                            # Atomāri: tmp → replace
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(snapshot(), f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+
+# ---------- EKSPORTS ----------
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):                    # Bez piekļuves žurnāla stderr
+        pass
+
+
+def serve(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:  # http://host:port/metrics
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def dump_periodically(path: str, interval: float = 15.0) -> threading.Thread:
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                dump_json(path)
+            except OSError:                          # Disks pilns u. tml. – nākamreiz
+                pass
+
+    thread = threading.Thread(target=run, name="metrics-json", daemon=True)
+    thread.start()
+    return thread
+
+
+def start_from_env() -> dict:                        # METRICS_PORT / METRICS_JSON(_INTERVAL)
+    started = {}
+    port = os.environ.get("METRICS_PORT")
+    if port:
+        started["http"] = serve(int(port))
+    path = os.environ.get("METRICS_JSON")
+    if path:
+        interval = float(os.environ.get("METRICS_JSON_INTERVAL", 15))
+        started["json"] = dump_periodically(path, interval)
+    return started
@@ -0,0 +1,175 @@
+import threading                # Sesijas slēdzene
+import weakref                  # Komplektu tur reģistrs, ne sesija
+from collections import deque   # Sagatavoto raundu rindas
+from concurrent.futures import ThreadPoolExecutor  # Fona sagatavošana
+from dataclasses import dataclass  # Raundu struktūras
+import numpy as np              # Apkārtnes mediāna
+import metrics                  # Trāpījumi/garām
+from cards import PropertyRecord  # Īpašuma ieraksts
+from dataset import DatasetBundle  # Pilsētas komplekts
+from price_index import DIFFICULTY_LEVELS, pick_partner  # Pāru grūtība
+from sampler import ListingSampler  # Nejauša secība bez atkārtojumiem
+
+PREFETCH_DEPTH = 3              # Cik raundus turēt gatavus katram režīmam
+COMPARABLE_RADIUS_M = 500       # “Līdzīgi īpašumi” rādiuss metros
+ANY_RATIO = (1.0, np.inf)       # Cenu attiecība bez ierobežojuma
+_executor = None                # Kopīgs pavedienu kopums visām sesijām
+_executor_lock = threading.Lock()
+
+
+def executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+        return _executor
+
+
+@dataclass
+class Neighbourhood:                                 # Līdzīgi īpašumi rādiusā (gatavi kartei)
+    part: str                                        # "rent" / "sale"
+    count: int                                       # Sludinājumu skaits rādiusā
+    median_ppm2: float                               # Mediānā cena/m²
+    own_ppm2: float                                  # Šī īpašuma cena/m²
+    map_data: dict                                   # {"lat": …, "lon": …} st.map
+
+
+@dataclass
+class PriceRound:                                    # Cenu minēšanas raunds
+    # Viss, ko vērtē, ir kopēts raundā: pēc krātuves papildināšanas kopējie
+    # indeksi nobīdās, tāpēc pēc `idx` jaunajā komplektā neko nemeklē.
+    prop: PropertyRecord                             # Ieraksts (ar cenu)
+    card: tuple                                      # (darījuma teikums, kreisā, labā kolonna)
+    nearby: Neighbourhood | None                     # Apkārtne (None – nav koordināšu)
+    estimate: float                                  # Modeļa cena (NaN, ja nav)
+    key: str                                         # Sludinājuma atslēga vēsturei
+
+    @property
+    def idx(self) -> int:
+        return self.prop.idx
+
+
+@dataclass
+class PairRound:                                     # “Kurš ir dārgāks?” raunds
+    part: str                                        # "rent" / "sale"
+    a: int                                           # Kopējie indeksi (tikai šim komplektam)
+    b: int
+    summary_a: str                                   # Gatavi apraksti
+    summary_b: str
+    price_a: float                                   # Cenas vērtēšanai
+    price_b: float
+    key_a: str                                       # Sludinājumu atslēgas vēsturei
+    key_b: str
+    settings: tuple                                  # (grūtība, viens rajons), ar ko izvēlēts
+
+
+def neighbourhood(bundle: DatasetBundle, prop: PropertyRecord,
+                  radius_m: float = COMPARABLE_RADIUS_M) -> Neighbourhood | None:
+    part = bundle.cards.op[prop.idx]                 # "rent" / "sale" / None
+    if part is None or not prop.has_location:
+        return None
+    grid = bundle.spatial[part]                      # Indekss ar nodalījuma indeksiem
+    frame = bundle.rent if part == "rent" else bundle.sale
+    local = prop.idx - bundle.offset(part)
+    near, _ = grid.radius(prop.lat, prop.lon, radius_m)
+    near = near[(near != local) & bundle.quality.parts[part].mask[near]]  # Bez paša un izlēcējiem
+    ppm2 = frame["price_per_m2"].to_numpy()
+    median = float(np.nanmedian(ppm2[near])) if len(near) else float("nan")
+    return Neighbourhood(part, len(near), median, float(ppm2[local]), grid.map_data(near))
+
+
+class Prefetcher:                                    # Sesijas nākamie raundi, gatavoti fonā
+    # Visi izvilkumi iet caur šo objektu (arī sinhronie, ja rinda tukša), un
+    # cenu un pāru raundiem ir atsevišķas plūsmas, tāpēc ar ?seed secība nav
+    # atkarīga no tā, kad fona pavediens paspēj tos sagatavot. Komplektu
+    # padod katram izsaukumam un glabā tikai vāju atsauci, lai sesija to
+    # neturētu atmiņā pēc tam, kad reģistrs pilsētu izlicis.
+    def __init__(self, bundle: DatasetBundle, seeds: dict, depth: int = PREFETCH_DEPTH):
+        self._bundle = weakref.ref(bundle)           # Kuram komplektam ir izlases
+        self.depth = depth
+        self.samplers = {                            # Izlase pa derīgo rindu pozīcijām
+            name: ListingSampler(len(bundle.valid[name]), seeds.get(name))
+            for name in ("all", "rent", "sale")
+        }
+        self.pair_rng = np.random.default_rng(seeds.get("pair"))  # Pāru īre/pārdošana
+        self.prices = deque()                        # Gatavi PriceRound
+        self.pairs = deque()                         # Gatavi PairRound
+        self.pair_settings = None                    # Pēdējie pieprasītie pāru iestatījumi
+        self._lock = threading.Lock()                # Izlases un rindas – vienā pavedienā
+        self._pending = None                         # Fona uzdevums
+
+    def serves(self, bundle: DatasetBundle) -> bool:  # Vai izlases ir šim komplektam
+        return self._bundle() is bundle
+
+    # ---------- SAGATAVOŠANA ----------
+    def _price_round(self, bundle: DatasetBundle) -> PriceRound:
+        cards = bundle.cards
+        prop = cards.record(int(bundle.valid["all"][self.samplers["all"].draw()]))
+        return PriceRound(prop, cards.render(prop.idx), neighbourhood(bundle, prop),
+                          float(cards.estimate[prop.idx]), bundle.listing_key(prop.idx))
+
+    def _pair_round(self, bundle: DatasetBundle, settings: tuple) -> PairRound | None:
+        difficulty, same_district = settings
+        sizes = {"rent": len(bundle.valid["rent"]), "sale": len(bundle.valid["sale"])}
+        use_rent = self.pair_rng.random() < 0.5      # Nejauši izvēlas īre/pārdošana
+        part = "rent" if (use_rent and sizes["rent"] >= 2) else "sale"
+        if sizes[part] < 2:                          # Pamata kopā nav 2 ierakstu → otra
+            part = "sale" if part == "rent" else "rent"
+            if sizes[part] < 2:
+                return None                          # Nav iespējams izveidot pāri
+        sampler = self.samplers[part]                # Pozīcijas valid[part]; neatkārtojas līdz kopa iziet
+        ratio = DIFFICULTY_LEVELS[difficulty]        # Cenu attiecības robežas
+        if ratio is None and not same_district:      # “Nejauši”
+            idx = sampler.draw_pair()
+        else:
+            if ratio is None:                        # “Nejauši” no viena rajona – jebkura attiecība
+                ratio = ANY_RATIO
+            anchor = sampler.draw()                  # Pirmais – no izlases
+            partner = pick_partner(                  # Otrais – bisekcija cenu indeksā
+                bundle.price_index[part], anchor, ratio, sampler.rng, same_district,
+            )
+            idx = (anchor, partner) if sampler.coin() else (partner, anchor)  # A/B nejauši
+        base = bundle.offset(part)                   # Nodalījuma sākums kopējā tabulā
+        valid = bundle.valid[part]                   # Pozīcija → lokālais indekss
+        a, b = base + int(valid[idx[0]]), base + int(valid[idx[1]])
+        cards = bundle.cards
+        return PairRound(part, a, b, cards.summary(a), cards.summary(b),
+                         float(cards.price[a]), float(cards.price[b]),
+                         bundle.listing_key(a), bundle.listing_key(b), settings)
+
+    def _fill(self, bundle: DatasetBundle):          # Fonā: papildina rindas līdz `depth`
+        while True:
+            with self._lock:                         # Slēdzene uz vienu raundu, ne visu ciklu
+                if len(self.prices) < self.depth:
+                    self.prices.append(self._price_round(bundle))
+                    continue
+                if self.pair_settings is not None and len(self.pairs) < self.depth:
+                    pair = self._pair_round(bundle, self.pair_settings)
+                    if pair is not None:
+                        self.pairs.append(pair)
+                        continue
+            return
+
+    def refill(self, bundle: DatasetBundle):         # Palaiž fona papildināšanu, ja tā neiet
+        if self._pending is None or self._pending.done():
+            self._pending = executor().submit(self._fill, bundle)  # Atsauce tikai uzdevuma laikā
+
+    # ---------- IZSNIEGŠANA ----------
+    def next_price(self, bundle: DatasetBundle) -> PriceRound:
+        with self._lock:
+            hit = bool(self.prices)
+            round_ = self.prices.popleft() if hit else self._price_round(bundle)
+        metrics.count("prefetch", mode="price", result="hit" if hit else "miss")
+        self.refill(bundle)
+        return round_
+
+    def next_pair(self, bundle: DatasetBundle, settings: tuple) -> PairRound | None:
+        with self._lock:
+            if settings != self.pair_settings:       # Cita grūtība → vecie pāri neder
+                self.pairs.clear()
+                self.pair_settings = settings
+            hit = bool(self.pairs)
+            round_ = self.pairs.popleft() if hit else self._pair_round(bundle, settings)
+        metrics.count("prefetch", mode="pair", result="hit" if hit else "miss")
+        self.refill(bundle)
+        return round_
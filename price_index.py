@@ -0,0 +1,81 @@
+import numpy as np              # Kārtoti masīvi un bisekcija
+
+DIFFICULTY_LEVELS = {           # Grūtība → pieļaujamā dārgākā/lētākā cenu attiecība
+    "Nejauši": None,            # Kā agrāk: jebkuri divi īpašumi
+    "Viegli": (1.5, np.inf),    # Cenas atšķiras vismaz 1,5×
+    "Vidēji": (1.15, 1.5),      # 15–50% atšķirība
+    "Grūti": (1.0, 1.15),       # Līdz 15% atšķirība
+}
+
+
+class PriceIndex:                                    # Nodalījuma īpašumi, kārtoti pēc cenas
+    # Ar `group` (piem., rajona kodiem) kārto pēc grupas, tad cenas, un
+    # partneri meklē tikai tās pašas grupas segmentā.
+    def __init__(self, price: np.ndarray, group: np.ndarray | None = None):
+        price = np.asarray(price, dtype=np.float64)
+        self.grouped = group is not None
+        if group is None:                            # Bez grupām – viena grupa
+            group = np.zeros(len(price), dtype=np.int32)
+        group = np.asarray(group, dtype=np.int32)
+        order = np.lexsort((price, group))           # Grupa (rajons), tad cena
+        self.order = order.astype(np.int32)          # Pozīcija kārtojumā → rinda
+        self.price = price[order]                    # Kārtotās cenas
+        self.group = group[order]                    # Kārtotās grupas
+        self.rank = np.empty(len(order), dtype=np.int32)  # Rinda → pozīcija kārtojumā
+        self.rank[order] = np.arange(len(order), dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _segment(self, r: int) -> tuple:             # Meklēšanas robežas [s, e)
+        if not self.grouped:
+            return 0, len(self.order)
+        g = self.group[r]
+        return (int(np.searchsorted(self.group, g, "left")),
+                int(np.searchsorted(self.group, g, "right")))
+
+    def partner(self, i: int, ratio: tuple, rng: np.random.Generator) -> int | None:
+        # Otrs pāra īpašums, kura cenu attiecība pret `i` ir robežās `ratio`.
+        # Meklē ar bisekciju (O(log n)); ja tādu nav – ņem tuvāko pēc cenas.
+        # None, ja `i` grupā nav neviena cita īpašuma.
+        r = int(self.rank[i])
+        s, e = self._segment(r)
+        if e - s < 2:
+            return None
+        prices = self.price[s:e]                     # Skats, ne kopija
+        p = self.price[r]
+        lo, hi = ratio
+        bounds = [                                   # Lētākie un dārgākie kandidāti
+            (np.searchsorted(prices, p / hi, "left"), np.searchsorted(prices, p / lo, "right")),
+            (np.searchsorted(prices, p * lo, "left"), np.searchsorted(prices, p * hi, "right")),
+        ]
+        (a1, b1), (a2, b2) = [(int(a) + s, int(b) + s) for a, b in bounds]
+        if a2 <= b1:                                 # Diapazoni pārklājas → apvieno
+            ranges = [(a1, max(b1, b2))]
+        else:
+            ranges = [(a1, b1), (a2, b2)]
+        sizes = [b - a - (a <= r < b) for a, b in ranges]  # Bez paša `i`
+        total = sum(sizes)
+        if total == 0:                               # Nav kandidātu → kaimiņš pēc cenas
+            k = r + 1 if r + 1 < e else r - 1
+            return int(self.order[k])
+        pick = int(rng.integers(total))
+        for (a, b), size in zip(ranges, sizes):
+            if pick < size:
+                k = a + pick
+                if a <= r <= k:                      # Izlaiž paša `i` pozīciju
+                    k += 1
+                return int(self.order[k])
+            pick -= size
+        return None
+
+
+def pick_partner(indexes: dict, i: int, ratio: tuple, rng: np.random.Generator,
+                 same_group: bool = False) -> int | None:
+    # `indexes` = {False: visa nodalījuma indekss, True: indekss pa rajoniem}
+    j = indexes[True].partner(i, ratio, rng) if same_group else None
+    return j if j is not None else indexes[False].partner(i, ratio, rng)
+
+
+def build_price_indexes(price: np.ndarray, group: np.ndarray) -> dict:
+    return {False: PriceIndex(price), True: PriceIndex(price, group)}
@@ -0,0 +1,75 @@
+import time                     # Sienas pulkstenis
+import tracemalloc              # Atmiņas maksimums sekcijā
+import metrics                  # Procesa metriku reģistrs
+
+# Iezīmētas app.py sekcijas. Katras sekcijas laiks vienmēr nonāk metrikās;
+# detalizētu Profile (arī atmiņu) ieslēdz `start()` – to dara benchmarks/bench_app.py.
+_active = None                  # Aktīvais Profile vai None
+
+
+class Profile:                                       # Sekcija → [izsaukumi, laiks s, maks. atmiņa B]
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.sections = {}
+        self._stack = []                             # Atvērtās sekcijas: [sākums, atmiņa, maksimums]
+
+    def _peak(self) -> int:                          # Maksimums kopš pēdējā reset_peak
+        return tracemalloc.get_traced_memory()[1] if self.memory else 0
+
+    def enter(self):
+        if self.memory:
+            peak = self._peak()
+            for frame in self._stack:                # Ārējās sekcijas neaizmirst savu maksimumu
+                frame[2] = max(frame[2], peak)
+            tracemalloc.reset_peak()
+        mem = tracemalloc.get_traced_memory()[0] if self.memory else 0
+        self._stack.append([time.perf_counter(), mem, mem])
+
+    def exit(self, name: str):
+        t0, mem0, peak = self._stack.pop()
+        elapsed = time.perf_counter() - t0
+        peak = max(peak, self._peak())
+        for frame in self._stack:
+            frame[2] = max(frame[2], peak)
+        if self.memory:
+            tracemalloc.reset_peak()
+        stats = self.sections.setdefault(name, [0, 0.0, 0])
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], peak - mem0)
+
+
+class section:                                       # with section("nosaukums"): ...
+    __slots__ = ("name", "profile", "t0")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.profile = _active
+        if self.profile is not None:
+            self.profile.enter()
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        metrics.observe(self.name, time.perf_counter() - self.t0)
+        if self.profile is not None:
+            self.profile.exit(self.name)
+        return False                                 # Izņēmumi (arī st.stop) iet tālāk
+
+
+def start(memory: bool = False) -> Profile:          # Sāk jaunu mērījumu
+    global _active
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _active = Profile(memory)
+    return _active
+
+
+def stop() -> Profile | None:                        # Beidz mērījumu, atgriež rezultātu
+    global _active
+    profile, _active = _active, None
+    if profile is not None and profile.memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return profile
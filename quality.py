@@ -0,0 +1,150 @@
+import time                     # Pārbaudes ilgums
+from dataclasses import dataclass, field  # Atskaites struktūras
+import numpy as np              # Vektorizētas pārbaudes
+import pandas as pd             # Rajonu statistika
+
+# Datu kvalitātes posms, vienreiz ielādē. Cena/m² izlēcējus meklē log skalā
+# pa darījuma tipu × rajonu: rinda ir izlēcēja, ja tā ir ārpus abām robežām –
+# robustā z (mediāna/MAD) un IQR. Rindas netiek dzēstas (kopējie indeksi
+# paliek tie paši); izlase ņem tikai derīgo rindu indeksus.
+
+Z_LIMIT = 3.5                   # Robustā z robeža: 0,6745·|x − mediāna| / MAD
+IQR_K = 3.0                     # Robeža [Q1 − k·IQR, Q3 + k·IQR]
+MIN_GROUP = 20                  # Mazākam rajonam – visa nodalījuma robežas
+REASONS = (                     # Kods → noraidīšanas iemesls (0 = derīga)
+    "ok",
+    "ppm2_missing",             # Nav cenas/m²
+    "floor_above_total",        # Stāvs augstāk par mājas stāvu skaitu
+    "op_mismatch",              # Cena/m² atbilst otram darījuma tipam
+    "ppm2_outlier",             # Cena/m² ārpus rajona robežām
+)
+REASON_LV = {                   # Iemesls → teksts lietotājam
+    "ppm2_missing": "nav cenas par m²",
+    "floor_above_total": "stāvs augstāks par mājas stāvu skaitu",
+    "op_mismatch": "cena atbilst otram darījuma tipam",
+    "ppm2_outlier": "neticama cena par m² rajonā",
+}
+
+
+def _numbers(df: pd.DataFrame, col: str) -> np.ndarray:  # Kolonna → float (nav datu → NaN)
+    if col not in df.columns:
+        return np.full(len(df), np.nan)
+    vals = pd.to_numeric(df[col], errors="coerce").to_numpy(np.float64, na_value=np.nan)
+    return np.where(vals < 0, np.nan, vals)          # Krātuvē -1 = nav datu
+
+
+def _codes(df: pd.DataFrame) -> tuple:               # (rajona kodi, nosaukumi); -1 = nav rajona
+    if "district" not in df.columns:
+        return np.full(len(df), -1, dtype=np.int32), []
+    col = df["district"].astype("category")
+    return col.cat.codes.to_numpy(np.int32), [str(c) for c in col.cat.categories]
+
+
+def _robust(values: np.ndarray, codes: np.ndarray) -> pd.DataFrame:  # Grupa → statistika + robežas
+    g = pd.Series(values).groupby(codes)
+    median = g.median()
+    dev = np.abs(values - median.reindex(codes).to_numpy())
+    t = pd.DataFrame({
+        "count": g.size(),
+        "median": median,
+        "mad": pd.Series(dev).groupby(codes).median(),
+        "q1": g.quantile(0.25),
+        "q3": g.quantile(0.75),
+    })
+    spread = t["mad"] / 0.6745 * Z_LIMIT
+    iqr = t["q3"] - t["q1"]
+    t["lo"] = np.minimum(t["median"] - spread, t["q1"] - IQR_K * iqr)  # Plašākā no abām
+    t["hi"] = np.maximum(t["median"] + spread, t["q3"] + IQR_K * iqr)
+    return t
+
+
+@dataclass
+class PartQuality:                                   # Viena nodalījuma pārbaudes rezultāts
+    reason: np.ndarray                               # int8 iemesla kods katrai rindai (0 = derīga)
+    stats: pd.DataFrame                              # Rajons → count, median/lo/hi EUR/m², own, rejected
+    bounds: tuple                                    # Nodalījuma (lo, hi) log(cena/m²)
+    mask: np.ndarray = field(init=False)             # Derīgās rindas (bool)
+    valid: np.ndarray = field(init=False)            # Derīgo rindu lokālie indeksi (int32)
+    rejected: dict = field(init=False)               # Iemesls → noraidīto skaits (vienreiz)
+
+    def __post_init__(self):
+        self.mask = self.reason == 0
+        self.valid = np.flatnonzero(self.mask).astype(np.int32)
+        counts = np.bincount(self.reason, minlength=len(REASONS))
+        self.rejected = {REASONS[k]: int(n) for k, n in enumerate(counts) if k and n}
+
+
+@dataclass
+class QualityReport:                                 # Visu nodalījumu pārbaude
+    parts: dict                                      # Nodalījums → PartQuality
+    seconds: float = 0.0
+
+    @property
+    def rejected(self) -> dict:                      # Iemesls → skaits visos nodalījumos
+        out = {}
+        for part in self.parts.values():
+            for name, n in part.rejected.items():
+                out[name] = out.get(name, 0) + n
+        return out
+
+    def __str__(self) -> str:
+        lines = []
+        for name, part in self.parts.items():
+            rejected = ", ".join(f"{k}: {v}" for k, v in part.rejected.items()) or "nav"
+            lines.append(f"{name}: {len(part.valid)}/{len(part.reason)} derīgas, noraidītas – {rejected}")
+        return "\n".join(lines) + f"\n({self.seconds * 1000:.1f} ms)"
+
+
+def check_parts(parts: dict) -> QualityReport:       # Nodalījums → DataFrame ar price_per_m2
+    t0 = time.perf_counter()
+    prep = {}
+    for name, part in parts.items():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            logp = np.log(part["price_per_m2"].to_numpy(np.float64))
+        floor, total = _numbers(part, "floor"), _numbers(part, "total_floors")
+        missing = ~np.isfinite(logp)
+        floor_bad = floor > total                    # NaN salīdzinājums → False
+        codes, names = _codes(part)
+        ok = ~(missing | floor_bad)                  # Statistikai – tikai ticamās rindas
+        groups = _robust(logp[ok], codes[ok])
+        overall = _robust(logp[ok], np.zeros(int(ok.sum()), dtype=np.int32))
+        lo = np.full(len(names) + 1, overall["lo"].get(0, np.nan))  # Pēdējais (kods -1) – nodalījums
+        hi = np.full(len(names) + 1, overall["hi"].get(0, np.nan))
+        groups = groups[groups.index >= 0]           # Rindas bez rajona – tikai nodalījumā
+        own = groups.index[(groups["count"] >= MIN_GROUP) & (groups["mad"] > 0)]
+        lo[own], hi[own] = groups.loc[own, "lo"], groups.loc[own, "hi"]
+        prep[name] = (logp, missing, floor_bad, codes, names, groups, own, lo, hi)
+
+    out = {}
+    for name, (logp, missing, floor_bad, codes, names, groups, own, lo, hi) in prep.items():
+        outside = ~((logp >= lo[codes]) & (logp <= hi[codes]))
+        other = np.zeros(len(logp), dtype=bool)      # Ticams citā nodalījumā
+        for other_name, other_prep in prep.items():
+            if other_name != name:                   # Otra nodalījuma kopējās robežas
+                other_lo, other_hi = other_prep[-2][-1], other_prep[-1][-1]
+                other |= (logp >= other_lo) & (logp <= other_hi)
+        reason = np.select(
+            [missing, floor_bad, outside & other, outside], [1, 2, 3, 4], 0,
+        ).astype(np.int8)
+        code = groups.index.to_numpy()
+        rejected = pd.Series(reason != 0).groupby(codes).sum()
+        stats = pd.DataFrame({
+            "count": groups["count"].to_numpy(np.int64),
+            "median_ppm2": np.exp(groups["median"].to_numpy()),
+            "lo_ppm2": np.exp(lo[code]),
+            "hi_ppm2": np.exp(hi[code]),
+            "own": np.isin(code, own),
+            "rejected": rejected.reindex(code, fill_value=0).to_numpy(np.int64),
+        }, index=pd.Index([names[c] for c in code], name="district"))
+        out[name] = PartQuality(reason, stats, (lo[-1], hi[-1]))
+    return QualityReport(out, time.perf_counter() - t0)
+
+
+if __name__ == "__main__":                           # python quality.py [riga.csv ...]
+    import sys
+    from dataset import add_derived
+    from listing_store import open_store
+    for csv in sys.argv[1:] or ["riga.csv"]:
+        store = open_store(csv)
+        report = check_parts({name: add_derived(store.frame(name)) for name in ("rent", "sale")})
+        print(f"{csv}:\n{report}")
@@ -0,0 +1,157 @@
+import csv                      # Bojātu CSV rindu pārparsēšana
+import numpy as np              # Tēmu statistika, nejaušība
+import pandas as pd             # Ievade no CSV / agregātiem
+
+LETTERS = "ABCD"                # Atbilžu burti
+MISSING_OPTION = "[Trūkst atbildes {}]"  # Teksts tukšam variantam
+GENERAL = "Vispārīgi"           # Tēma, ja neviens atslēgvārds neder
+TOPIC_KEYWORDS = {              # Tēma → atslēgvārdi jautājuma tekstā (ja CSV nav kolonnas "topic")
+    "Cenas": ("cen", "vērtīb", "dārg", "lēt"),
+    "Mājas un konstrukcijas": ("māja", "mājas", "konstrukc", "paneļ", "koka", "stāv"),
+    "Sludinājumu termini": ("nozīmē", "termin", "sludinājum", "apdares"),
+}
+DISTRICT_TOPIC = "Rajonu cenas"  # Ģenerēto jautājumu tēma
+MIN_DISTRICT_LISTINGS = 20      # Rajons jautājumam, ja tajā ir vismaz tik sludinājumu
+DISTRACTORS = (0.6, 0.8, 1.25, 1.6)  # Nepareizo skaitlisko atbilžu reizinātāji
+GENERATED_PER_KIND = 6          # Cik ģenerēt katram jautājuma veidam
+
+
+def _repair(df: pd.DataFrame) -> pd.DataFrame:       # Rindas, kas visas ielasītas pirmajā laukā
+    if "correct_option" not in df.columns:
+        return df
+    broken = df["correct_option"].isna() & df.iloc[:, 0].astype(str).str.contains(",")
+    for i in np.flatnonzero(broken.to_numpy()):
+        fields = next(csv.reader([str(df.iat[i, 0])]))
+        if len(fields) == len(df.columns):
+            df.iloc[i] = fields
+    return df
+
+
+def _topic(text: str) -> str:                        # Tēma pēc atslēgvārdiem
+    low = text.lower()
+    for topic, words in TOPIC_KEYWORDS.items():
+        if any(w in low for w in words):
+            return topic
+    return GENERAL
+
+
+def _numeric_options(value: float, rng, fmt: str) -> tuple:  # (4 formatēti varianti, pareizā nr.)
+    factors = rng.choice(DISTRACTORS, 3, replace=False)
+    values = np.append(value * factors, value)
+    order = rng.permutation(4)
+    return tuple(fmt.format(v) for v in values[order]), int(np.flatnonzero(order == 3)[0])
+
+
+def district_questions(stats: pd.DataFrame, seed: int = 0) -> list:
+    # Skaitliski jautājumi no iepriekš aprēķinātiem rajonu agregātiem:
+    # (teksts, 4 varianti, pareizā nr., tēma)
+    rng = np.random.default_rng(seed)
+    out = []
+    sale = stats[(stats["part"] == "sale") & (stats["count"] >= MIN_DISTRICT_LISTINGS)]
+    rent = stats[(stats["part"] == "rent") & (stats["count"] >= MIN_DISTRICT_LISTINGS)]
+    for _, row in sale.sample(min(GENERATED_PER_KIND, len(sale)), random_state=seed).iterrows():
+        options, correct = _numeric_options(row["median_ppm2"], rng, "{:,.0f} EUR/m²")
+        out.append((f"Kāda ir pārdodamo dzīvokļu mediānā cena par m² rajonā {row['district']}?",
+                    options, correct, DISTRICT_TOPIC))
+    for _, row in rent.sample(min(GENERATED_PER_KIND, len(rent)), random_state=seed).iterrows():
+        options, correct = _numeric_options(row["median_price"], rng, "{:,.0f} EUR mēnesī")
+        out.append((f"Kāda ir mediānā īres maksa rajonā {row['district']}?",
+                    options, correct, DISTRICT_TOPIC))
+    if len(sale) >= 4:                               # Kurš no 4 rajoniem dārgākais
+        for _ in range(GENERATED_PER_KIND):
+            four = sale.iloc[rng.choice(len(sale), 4, replace=False)]
+            out.append(("Kurā no šiem rajoniem pārdodamo dzīvokļu mediānā cena par m² ir augstākā?",
+                        tuple(four["district"].astype(str)),
+                        int(np.argmax(four["median_ppm2"].to_numpy())), DISTRICT_TOPIC))
+    return out
+
+
+class QuizBank:                                      # Kompilēta jautājumu banka (kopīga visām sesijām)
+    def __init__(self, questions: list):
+        self.text = [q[0] for q in questions]
+        self.options = [                             # Gatavi radio varianti "A: …"
+            tuple(f"{LETTERS[k]}: {o}" for k, o in enumerate(q[1])) for q in questions
+        ]
+        self.correct = np.array([q[2] for q in questions], dtype=np.int8)  # 0..3
+        self.topics = sorted({q[3] for q in questions})
+        self.topic = np.array([self.topics.index(q[3]) for q in questions], dtype=np.int16)
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    @property
+    def empty(self) -> bool:
+        return not self.text
+
+    def letter(self, q: int) -> str:                 # Pareizās atbildes burts
+        return LETTERS[self.correct[q]]
+
+
+def compile_quiz(path: str, stats: pd.DataFrame | None = None) -> QuizBank:
+    questions = []
+    try:
+        df = _repair(pd.read_csv(path, dtype=str))
+    except Exception:                                # Nav faila → tikai ģenerētie jautājumi
+        df = pd.DataFrame()
+    if not df.empty:
+        has_topic = "topic" in df.columns
+        for row in df.itertuples(index=False):
+            row = row._asdict()
+            letter = str(row.get("correct_option") or "").strip().upper()
+            if not isinstance(row.get("question"), str) or letter not in LETTERS:
+                continue                             # Nelabojama rinda
+            options = tuple(
+                row[f"option_{c}"] if isinstance(row.get(f"option_{c}"), str)
+                else MISSING_OPTION.format(c.upper())
+                for c in "abcd"
+            )
+            topic = row["topic"] if has_topic and isinstance(row["topic"], str) else _topic(row["question"])
+            questions.append((row["question"], options, LETTERS.index(letter), topic))
+    if stats is not None and not stats.empty:
+        questions += district_questions(stats)
+    return QuizBank(questions)
+
+
+class QuizSession:                                   # Vienas sesijas viktorīnas stāvoklis
+    # Atbildētie jautājumi ir viens int bitu lauks (nevis N session_state
+    # atslēgas); nākamo jautājumu ņem no tēmas, kurā spēlētājam sokas sliktāk.
+    def __init__(self, bank: QuizBank, seed=None):
+        self.n = len(bank)
+        self.rng = np.random.default_rng(seed)
+        self.answered = 0                            # Bitu lauks: bits q = jautājums q atbildēts
+        self.stats = np.zeros((len(bank.topics), 2), dtype=np.int32)  # Tēma → [mēģinājumi, pareizi]
+        self.current = None
+        self.next(bank)
+
+    @property
+    def done(self) -> int:                           # Atbildēto skaits
+        return self.answered.bit_count()
+
+    @property
+    def finished(self) -> bool:
+        return self.done >= self.n
+
+    def is_answered(self, q: int) -> bool:
+        return bool(self.answered >> q & 1)
+
+    def answer(self, bank: QuizBank, q: int, choice: int) -> bool:  # Atzīmē un atjauno tēmas statistiku
+        correct = choice == bank.correct[q]
+        self.answered |= 1 << q
+        self.stats[bank.topic[q]] += (1, int(correct))
+        return correct
+
+    def next(self, bank: QuizBank):                  # Nākamais neatbildētais no vājākās tēmas
+        bits = np.frombuffer(self.answered.to_bytes((self.n + 7) // 8, "little"), dtype=np.uint8)
+        mask = np.unpackbits(bits, count=self.n, bitorder="little") == 0  # Neatbildētie
+        if self.current is not None and mask.sum() > 1:
+            mask[self.current] = False               # Izlaistu neatkārto uzreiz
+        if not mask.any():
+            self.current = None
+            return
+        tries, right = self.stats[:, 0], self.stats[:, 1]
+        weakness = (tries - right + 1) / (tries + 2)  # Kļūdu īpatsvars ar Laplasa izlīdzināšanu
+        open_topics = np.unique(bank.topic[mask])
+        w = weakness[open_topics]
+        topic = self.rng.choice(open_topics, p=w / w.sum())
+        pool = np.flatnonzero(mask & (bank.topic == topic))
+        self.current = int(self.rng.choice(pool))
@@ -0,0 +1,122 @@
+import glob                     # Pilsētu failu meklēšana
+import mmap                     # Kartētu failu atpazīšana
+import os                       # Ceļi, vides mainīgie
+import threading                # Ielāde no vairākām sesijām
+from collections import OrderedDict  # LRU secība
+import numpy as np              # Masīvu izmēri
+import pandas as pd             # DataFrame izmēri
+import metrics                  # Ielāžu/izlikšanu skaitītāji
+from dataset import DatasetBundle, build_bundle, source_mtimes  # Viena pilsēta
+
+DEFAULT_CITIES = {"Rīga": "riga.csv"}  # Pamata komplekts
+CITIES_DIR = "cities"           # Papildu eksporti: cities/<pilsēta>.csv
+DEFAULT_BUDGET_MB = 1024        # Atmiņas budžets ielādētajiem komplektiem
+
+
+def discover_cities(root: str = ".") -> dict:        # Pilsētas nosaukums → CSV ceļš
+    cities = {name: path for name, path in DEFAULT_CITIES.items()
+              if os.path.exists(os.path.join(root, path))}
+    for path in sorted(glob.glob(os.path.join(root, CITIES_DIR, "*.csv"))):
+        name = os.path.splitext(os.path.basename(path))[0].replace("_", " ")
+        cities.setdefault(name[:1].upper() + name[1:], os.path.relpath(path, root))
+    return cities
+
+
+def _on_disk(arr) -> bool:                          # Masīvs ir skats uz kartētu failu
+    while arr is not None:
+        if isinstance(arr, (np.memmap, mmap.mmap)):
+            return True
+        arr = getattr(arr, "base", None)
+    return False
+
+
+def _column_nbytes(col: pd.Series) -> int:           # Kolonna bez memmap datiem (kategorijas, maskas – skaita)
+    values = col.array
+    if isinstance(values, pd.Categorical):
+        raw = values.codes
+    else:
+        raw = getattr(values, "_data", None)         # Maskētiem masīviem – datu daļa
+        if raw is None:
+            raw = np.asarray(values)
+    size = int(col.memory_usage(index=False))
+    return size - raw.nbytes if _on_disk(raw) else size
+
+
+def _nbytes(obj, seen: set) -> int:                  # Aptuvens atmiņā turēto masīvu izmērs
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.memmap):                   # Diska lapas – OS var atbrīvot
+        return 0
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, pd.DataFrame):
+        return sum(_column_nbytes(obj[name]) for name in obj.columns)
+    if isinstance(obj, dict):
+        return sum(_nbytes(v, seen) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(_nbytes(v, seen) for v in obj)
+    if hasattr(obj, "__dict__"):
+        return _nbytes(vars(obj), seen)
+    return 0
+
+
+def bundle_nbytes(bundle: DatasetBundle) -> int:
+    return _nbytes(bundle, set())
+
+
+class DatasetRegistry:                               # Pilsētu komplekti ar LRU un atmiņas budžetu
+    # Komplektu ielādē pirmajā pieprasījumā un dala visām sesijām. Ja kopējais
+    # izmērs pārsniedz budžetu, izliek senāk lietotās pilsētas (ne pieprasīto).
+    def __init__(self, cities: dict, quiz_path: str, budget_bytes: int | None = None):
+        self.cities = cities
+        self.quiz_path = quiz_path
+        if budget_bytes is None:
+            budget_bytes = int(os.environ.get("DATASET_MEMORY_MB", DEFAULT_BUDGET_MB)) << 20
+        self.budget = budget_bytes
+        self._lru = OrderedDict()                    # Pilsēta → (mtime, komplekts, baiti)
+        self._lock = threading.Lock()                # LRU struktūrai
+        self._loading = {}                           # Pilsēta → slēdzene (viena ielāde vienlaikus)
+
+    def __contains__(self, city: str) -> bool:
+        return city in self.cities
+
+    @property
+    def resident(self) -> dict:                      # Ielādētās pilsētas → baiti
+        with self._lock:
+            return {city: entry[2] for city, entry in self._lru.items()}
+
+    def get(self, city: str) -> DatasetBundle:
+        path = self.cities[city]
+        mtimes = source_mtimes(path, self.quiz_path)
+        with self._lock:
+            entry = self._lru.get(city)
+            if entry is not None and entry[0] == mtimes:
+                self._lru.move_to_end(city)          # Nesen lietots
+                return entry[1]
+            loading = self._loading.setdefault(city, threading.Lock())
+        with loading:                                # Citas sesijas gaida to pašu ielādi
+            with self._lock:
+                entry = self._lru.get(city)
+                if entry is not None and entry[0] == mtimes:
+                    self._lru.move_to_end(city)
+                    return entry[1]
+            previous = entry[1] if entry else None   # Novecojis – modeļa papildināšanai
+            bundle = build_bundle(path, self.quiz_path, previous)
+            size = bundle_nbytes(bundle)
+            metrics.count("bundle_builds", city=city)
+            with self._lock:
+                self._lru[city] = (mtimes, bundle, size)
+                self._lru.move_to_end(city)
+                self._evict(keep=city)
+        return bundle
+
+    def _evict(self, keep: str):                     # Zem self._lock
+        total = sum(entry[2] for entry in self._lru.values())
+        for city in list(self._lru):
+            if total <= self.budget:
+                break
+            if city == keep:
+                continue
+            total -= self._lru.pop(city)[2]
+            metrics.count("bundle_evictions", city=city)
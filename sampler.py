@@ -0,0 +1,73 @@
+import numpy as np              # Ģenerators un int32 buferis
+
+DENSE_FRACTION = 16             # Pēc n/16 izvilkumiem pāriet uz pilnu int32 buferi
+
+
+class ListingSampler:                                # Nejauša secība bez atkārtojumiem
+    # Fišera–Jeitsa jaukšana pa vienam solim katrā izvilkumā (O(1)).
+    # Kamēr izvilkumu maz, mainītās pozīcijas glabā vārdnīcā; kad to kļūst
+    # daudz – vienā int32 masīvā, tāpēc atmiņa nepārsniedz 4 baitus uz ierakstu.
+    def __init__(self, n: int, seed=None):
+        self.n = int(n)                              # Kopas lielums
+        self.seed = seed                             # Sēkla: int/saraksts (None → nejauša)
+        self.rng = np.random.default_rng(seed)       # Sesijas ģenerators
+        self.epoch = 0                               # Cik reizes kopa iziets cauri
+        self._reset_order()
+
+    def _reset_order(self):                          # Jauns caurgājiens
+        self.pos = 0                                 # Izvilkto skaits šajā caurgājienā
+        self._swaps = {}                             # Retais režīms: pozīcija → vērtība
+        self._perm = None                            # Blīvais režīms: int32 permutācija
+
+    def _get(self, i: int) -> int:
+        if self._perm is not None:
+            return int(self._perm[i])
+        return self._swaps.get(i, i)
+
+    def _set(self, i: int, v: int):
+        if self._perm is not None:
+            self._perm[i] = v
+        else:
+            self._swaps[i] = v
+
+    def _densify(self):                              # Vārdnīca → int32 masīvs
+        perm = np.arange(self.n, dtype=np.int32)
+        if self._swaps:
+            keys = np.fromiter(self._swaps.keys(), np.int64, len(self._swaps))
+            vals = np.fromiter(self._swaps.values(), np.int64, len(self._swaps))
+            perm[keys] = vals
+        self._perm, self._swaps = perm, {}
+
+    @property
+    def remaining(self) -> int:                      # Neizvilktie šajā caurgājienā
+        return self.n - self.pos
+
+    def draw(self) -> int:                           # Nākamais indekss
+        if self.n <= 0:
+            raise ValueError("Kopa ir tukša.")
+        if self.pos >= self.n:                       # Viss iziets → jauns caurgājiens
+            self.epoch += 1
+            self._reset_order()
+        if self._perm is None and len(self._swaps) * DENSE_FRACTION > self.n:
+            self._densify()
+        i = self.pos
+        j = int(self.rng.integers(i, self.n))        # Fišers–Jeitss: j ∈ [i, n)
+        vi, vj = self._get(i), self._get(j)
+        self._set(j, vi)                             # Apmaina vietām
+        self._set(i, vj)
+        if self._perm is None:
+            self._swaps.pop(i, None)                 # Pozīcija i vairs netiks lasīta
+        self.pos += 1
+        return vj
+
+    def draw_pair(self) -> tuple:                    # Divi dažādi indeksi
+        if self.n < 2:
+            raise ValueError("Pārim vajag vismaz 2 ierakstus.")
+        a = self.draw()
+        b = self.draw()
+        while b == a:                                # Tikai uz caurgājiena robežas
+            b = self.draw()
+        return a, b
+
+    def coin(self) -> bool:                          # Nejauša Jā/Nē no tā paša ģeneratora
+        return bool(self.rng.integers(2))
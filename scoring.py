@@ -0,0 +1,46 @@
+from dataclasses import dataclass  # Partijas rezultāts
+import numpy as np              # Vektorizēta punktu skaitīšana
+
+ERROR_THRESHOLDS = np.array([5.0, 10.0, 20.0])   # Kļūdas robežas %
+THRESHOLD_POINTS = np.array([5, 3, 2, 1])        # Punkti: ≤5%, ≤10%, ≤20%, citādi
+
+
+def error_percent(guess: float, real_price: float) -> float:  # Kļūda % vienam raundam
+    return abs(guess - real_price) / real_price * 100
+
+
+def calculate_points(error_pct: float) -> int:       # Punktu aprēķins pēc kļūdas
+    if error_pct <= 5:    return 5                   # ≤5% → 5 punkti
+    if error_pct <= 10:   return 3                   # ≤10% → 3 punkti
+    if error_pct <= 20:   return 2                   # ≤20% → 2 punkti
+    return 1                                         # Citādi → 1 punkts
+
+
+@dataclass
+class BatchScores:                                   # Visi raundi vienā piegājienā
+    error_pct: np.ndarray                            # Kļūda % (NaN – nederīga cena)
+    points: np.ndarray                               # Punkti (0 – raunds neskaitās)
+    valid: np.ndarray                                # Vai raunds ieskaitīts
+    score: np.ndarray                                # Kopējie punkti pēc katra raunda
+    rounds: np.ndarray                               # Raundu skaits pēc katra raunda
+    total_error: np.ndarray                          # Kopējā kļūda % pēc katra raunda
+    average_error: np.ndarray                        # Vidējā kļūda % pēc katra raunda
+
+
+def score_batch(guesses, indices, prices: np.ndarray) -> BatchScores:
+    # Tas pats, kas “Cenu minēšana” raunds pēc raunda: nederīgas cenas (≤ 0)
+    # raundu neieskaita, punkti pēc tām pašām robežām, summas secīgi.
+    guesses = np.asarray(guesses, dtype=np.float64)
+    real = np.asarray(prices, dtype=np.float64)[np.asarray(indices)]
+    valid = real > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        error_pct = np.where(valid, np.abs(guesses - real) / real * 100, np.nan)
+    points = THRESHOLD_POINTS[np.digitize(error_pct, ERROR_THRESHOLDS, right=True)]
+    points = np.where(valid, points, 0)
+    rounds = np.cumsum(valid)
+    total_error = np.cumsum(np.where(valid, error_pct, 0.0))  # cumsum summē secīgi
+    with np.errstate(divide="ignore", invalid="ignore"):
+        average_error = np.where(rounds > 0, total_error / rounds, 0.0)
+    return BatchScores(
+        error_pct, points, valid, np.cumsum(points), rounds, total_error, average_error,
+    )
@@ -0,0 +1,106 @@
+import numpy as np              # Režģa indekss
+
+EARTH_RADIUS_M = 6_371_000.0    # Zemes rādiuss metros
+
+
+class GridIndex:                                     # Režģa hash pār lat/lon
+    # Punktus projicē lokālās metru koordinātās (ekvidistantā projekcija ap
+    # vidējo platumu), sadala kvadrātšūnās un sakārto pēc šūnas, tāpēc katras
+    # šūnas punkti ir viens nepārtraukts gabals masīvā `order`.
+    def __init__(self, lat: np.ndarray, lon: np.ndarray, cell_m: float = 250.0):
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        ok = np.isfinite(lat) & np.isfinite(lon)     # Bez koordinātēm – neindeksē
+        self.cell_m = float(cell_m)
+        self.lat0 = float(np.mean(lat[ok])) if ok.any() else 0.0
+        self.lat = lat                               # Kartei (float64 – JSON serializējams)
+        self.lon = lon
+        x, y = self._project(lat, lon)
+        self.x = x.astype(np.float32)
+        self.y = y.astype(np.float32)
+        ids = np.flatnonzero(ok).astype(np.int32)
+        cx, cy = self._cell(x[ids], y[ids])
+        keys = self._key(cx, cy)
+        sort = np.argsort(keys, kind="stable")
+        self.order = ids[sort]                       # Punkti sakārtoti pēc šūnas
+        self.keys, self.starts = np.unique(keys[sort], return_index=True)
+        self.ends = np.append(self.starts[1:], len(self.order))
+        self.extent = float(max(np.ptp(x[ids]), np.ptp(y[ids]))) if len(ids) else 0.0
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _project(self, lat, lon) -> tuple:           # Grādi → metri
+        k = np.pi / 180 * EARTH_RADIUS_M
+        return np.asarray(lon) * k * np.cos(np.radians(self.lat0)), np.asarray(lat) * k
+
+    def _cell(self, x, y) -> tuple:
+        return (np.floor(np.asarray(x) / self.cell_m).astype(np.int64),
+                np.floor(np.asarray(y) / self.cell_m).astype(np.int64))
+
+    @staticmethod
+    def _key(cx, cy):                                # Šūnas (x, y) → viens int64
+        cx, cy = np.asarray(cx, dtype=np.int64), np.asarray(cy, dtype=np.int64)
+        return (cx << 32) + (cy & 0xFFFFFFFF)
+
+    def _candidates(self, x: float, y: float, rings: int) -> np.ndarray:  # Punkti šūnu kvadrātā
+        cx, cy = self._cell(x, y)
+        dx, dy = np.meshgrid(np.arange(-rings, rings + 1), np.arange(-rings, rings + 1))
+        keys = np.sort(self._key(cx + dx.ravel(), cy + dy.ravel()))
+        pos = np.searchsorted(self.keys, keys)
+        inside = pos < len(self.keys)
+        pos = pos[inside][self.keys[pos[inside]] == keys[inside]]  # Tikai aizņemtās šūnas
+        if len(pos) == 0:
+            return np.empty(0, dtype=np.int32)
+        return np.concatenate([self.order[s:e] for s, e in zip(self.starts[pos], self.ends[pos])])
+
+    def radius(self, lat: float, lon: float, radius_m: float) -> tuple:
+        # (indeksi, attālumi m) visiem punktiem rādiusā, sakārtoti pēc attāluma
+        x, y = self._project(lat, lon)
+        cand = self._candidates(x, y, int(np.ceil(radius_m / self.cell_m)))
+        d = np.hypot(self.x[cand] - x, self.y[cand] - y)
+        hit = d <= radius_m
+        cand, d = cand[hit], d[hit]
+        sort = np.argsort(d, kind="stable")
+        return cand[sort], d[sort].astype(np.float32)
+
+    def nearest(self, lat: float, lon: float, k: int) -> tuple:
+        # (indeksi, attālumi m) k tuvākajiem; paplašina šūnu gredzenus, līdz
+        # k-tais kandidāts ir tuvāk par pārbaudītā kvadrāta iekšējo malu
+        x, y = self._project(lat, lon)
+        k = min(int(k), len(self.order))
+        if k == 0:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        rings = 1
+        while True:
+            if rings * self.cell_m > self.extent:    # Kvadrāts aptver visu → visi punkti
+                cand = self.order
+            else:
+                cand = self._candidates(x, y, rings)
+            if len(cand) >= k:
+                d = np.hypot(self.x[cand] - x, self.y[cand] - y)
+                part = np.argpartition(d, k - 1)[:k]
+                if cand is self.order or d[part].max() <= rings * self.cell_m:
+                    sort = part[np.argsort(d[part], kind="stable")]
+                    return cand[sort], d[sort].astype(np.float32)
+            rings *= 2
+
+    def map_data(self, indices: np.ndarray) -> dict:  # Masīvi tieši st.map
+        return {"lat": self.lat[indices], "lon": self.lon[indices]}
+
+    def cell_summary(self, values: np.ndarray) -> dict:  # Šūnu vidējās vērtības siltuma kartei
+        n_cells = len(self.keys)
+        cell = np.repeat(np.arange(n_cells), self.ends - self.starts)
+        size = (self.ends - self.starts).astype(np.float64)
+        values = np.asarray(values, dtype=np.float64)[self.order]
+        ok = np.isfinite(values)
+        count = np.bincount(cell[ok], minlength=n_cells)
+        total = np.bincount(cell[ok], weights=values[ok], minlength=n_cells)
+        has = count > 0
+        center = lambda c: np.bincount(cell, weights=c[self.order], minlength=n_cells)[has] / size[has]
+        return {                                     # Šūnas centrs = tās punktu vidējais
+            "lat": center(self.lat),
+            "lon": center(self.lon),
+            "value": total[has] / count[has],
+            "count": count[has],
+        }